@@ -0,0 +1,220 @@
+"""
+Benchmark untuk jalur kritis: load, lookup, ranking, autocomplete dan render chart.
+
+Jalankan dari folder src/py:
+    python bench.py run --data ../../data/male_players.csv --scales 1 10 100 --output hasil.json
+    python bench.py compare lama.json baru.json --threshold 0.10
+
+Memori diukur dengan tracemalloc pada satu run terpisah: peak_kb adalah
+puncak memori selama operasi (termasuk objek sementara), retained_blocks
+adalah jumlah blok yang masih hidup setelah operasi selesai (selisih
+snapshot), bukan jumlah seluruh alokasi yang dilakukan.
+
+Data skala 10x/100x dibuat dengan mengulang baris CSV asli ke folder kerja
+(default: folder sementara sistem) dan dipakai ulang pada run berikutnya.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+import numpy as np
+import pandas as pd
+import load
+import features
+import search
+import charts
+import cache
+
+SAMPLE_SIZE = 50
+TYPED_QUERY = "Erling Haaland"
+
+
+def scaled_csv(file_path, scale, workdir):
+    """Path CSV berisi baris file_path diulang scale kali (dibuat sekali saja)."""
+    if scale == 1:
+        return file_path
+    stem = os.path.splitext(os.path.basename(file_path))[0]
+    target = os.path.join(workdir, f"{stem}_x{scale}.csv")
+    if os.path.exists(target) and os.path.getmtime(target) >= os.path.getmtime(file_path):
+        return target
+    with open(file_path, "r", encoding="utf-8") as f:
+        header = f.readline()
+        body = f.read()
+    if body and not body.endswith("\n"):
+        body += "\n"
+    tmp_path = target + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(header)
+        for _ in range(scale):
+            f.write(body)
+    os.replace(tmp_path, target)
+    return target
+
+
+def measure(func, repeat):
+    """
+    Waktu (median/min, ms) dari beberapa run, lalu satu run dengan tracemalloc
+    untuk peak memori dan blok yang tertahan setelah operasi.
+    """
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append((time.perf_counter() - start) * 1000)
+
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        tracemalloc.reset_peak()
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    retained = sum(stat.count_diff for stat in after.compare_to(before, "filename")
+                      if stat.count_diff > 0)
+    return {
+        "time_ms_median": statistics.median(times),
+        "time_ms_min": min(times),
+        "peak_kb": peak / 1024,
+        "retained_blocks": retained,
+    }
+
+
+def _operations(file_path, data_frame, cache_root):
+    rng = np.random.default_rng(0)
+    names = data_frame["Name"].dropna().to_numpy()
+    names = rng.choice(names, min(SAMPLE_SIZE, len(names)), replace=False).tolist()
+    clubs = data_frame["Club"].dropna().astype(str).unique()
+    clubs = rng.choice(clubs, min(SAMPLE_SIZE, len(clubs)), replace=False).tolist()
+    positions = data_frame["Position"].dropna().astype(str).unique().tolist()
+    completion = search.PrefixIndex(data_frame["Name"].dropna().unique().tolist())
+    view = charts.ChartView(data_frame)
+
+    def render_histogram():
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        view.histogram("Overall")
+        FigureCanvasAgg(view.figure).draw()
+
+    # (nama, fungsi, jumlah panggilan per run) -> waktu dilaporkan per panggilan
+    return [
+        ("load_csv_cold", lambda: load.load_csv_data(file_path, use_cache=False), 1),
+        ("load_csv_warm", lambda: load.load_csv_data(file_path, cache_root=cache_root), 1),
+        ("load_warm_and_prepare", lambda: features.prepare(load.load_csv_data(file_path, cache_root=cache_root)), 1),
+        ("info_player", lambda: [features.info_player(data_frame, n) for n in names], len(names)),
+        ("info_team", lambda: [features.info_team(data_frame, c) for c in clubs], len(clubs)),
+        ("top_player", lambda: features.top_player(data_frame), 1),
+        ("top_player_by_position",
+         lambda: [features.top_player_by_position(data_frame, p) for p in positions], len(positions)),
+        ("top_team", lambda: features.top_team(data_frame), 1),
+        ("autocomplete_build",
+         lambda: search.PrefixIndex(data_frame["Name"].dropna().unique().tolist()), 1),
+        ("autocomplete_keystroke",
+         lambda: [completion.search(TYPED_QUERY[:i]) for i in range(1, len(TYPED_QUERY) + 1)],
+         len(TYPED_QUERY)),
+        ("render_histogram", render_histogram, 1),
+    ]
+
+
+def run(args):
+    os.makedirs(args.workdir, exist_ok=True)
+    cache_root = os.path.join(args.workdir, load.CACHE_DIR_NAME)
+    # Cache hasil query dimatikan supaya yang diukur adalah perhitungannya, bukan cache hit
+    cache.configure(max_entries=0)
+    results = []
+    for scale in args.scales:
+        file_path = scaled_csv(args.data, scale, args.workdir)
+        # Isi cache biner dulu supaya load_csv_warm benar-benar mengukur warm start
+        data_frame = load.load_csv_data(file_path, cache_root=cache_root)
+        features.prepare(data_frame)
+        for name, func, calls in _operations(file_path, data_frame, cache_root):
+            if args.only and name not in args.only:
+                continue
+            repeat = 1 if name.startswith("load_") and scale > 10 else args.repeat
+            stats = measure(func, repeat)
+            for key in ("time_ms_median", "time_ms_min"):
+                stats[key] /= calls
+            result = {"scale": scale, "rows": len(data_frame), "op": name, "calls": calls, **stats}
+            results.append(result)
+            print(f"x{scale:<4} {name:<24} {stats['time_ms_median']:>10.3f} ms/call "
+                  f"peak {stats['peak_kb']:>10.1f} KiB  retained {stats['retained_blocks']:>8}",
+                  file=sys.stderr)
+
+    payload = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "pandas": pd.__version__,
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "data": os.path.abspath(args.data),
+            "repeat": args.repeat,
+        },
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(payload, f, indent=2)
+    else:
+        json.dump(payload, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+    return 0
+
+
+def compare(args):
+    """Bandingkan dua hasil; exit code 1 jika ada regresi melebihi threshold."""
+    with open(args.baseline, "r", encoding="utf-8") as f:
+        baseline = {(r["scale"], r["op"]): r for r in json.load(f)["results"]}
+    with open(args.candidate, "r", encoding="utf-8") as f:
+        candidate = {(r["scale"], r["op"]): r for r in json.load(f)["results"]}
+
+    regressions = 0
+    print(f"{'op':<28}{'lama (ms)':>12}{'baru (ms)':>12}{'rasio':>8}  {'peak':>8}  status")
+    for key in sorted(baseline.keys() & candidate.keys()):
+        old, new = baseline[key], candidate[key]
+        ratio = new["time_ms_median"] / old["time_ms_median"] if old["time_ms_median"] else float("inf")
+        peak_ratio = new["peak_kb"] / old["peak_kb"] if old["peak_kb"] else float("inf")
+        if ratio > 1 + args.threshold or peak_ratio > 1 + args.threshold:
+            status = "REGRESI"
+            regressions += 1
+        elif ratio < 1 - args.threshold:
+            status = "lebih cepat"
+        else:
+            status = "ok"
+        label = f"x{key[0]} {key[1]}"
+        print(f"{label:<28}{old['time_ms_median']:>12.3f}{new['time_ms_median']:>12.3f}"
+              f"{ratio:>8.2f}  {peak_ratio:>8.2f}  {status}")
+    for key in sorted(baseline.keys() ^ candidate.keys()):
+        print(f"x{key[0]} {key[1]}: hanya ada di {'lama' if key in baseline else 'baru'}")
+    return 1 if regressions else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="bench.py", description=__doc__.split("\n\n")[0].strip())
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="Jalankan benchmark")
+    run_parser.add_argument("--data", default=os.path.join("..", "..", "data", "male_players.csv"))
+    run_parser.add_argument("--scales", type=int, nargs="+", default=[1, 10, 100])
+    run_parser.add_argument("--repeat", type=int, default=5)
+    run_parser.add_argument("--only", nargs="+", help="Hanya jalankan operasi tertentu")
+    run_parser.add_argument("--workdir", default=os.path.join(tempfile.gettempdir(), "fifa_bench"))
+    run_parser.add_argument("--output", help="File JSON hasil (default: stdout)")
+
+    compare_parser = subparsers.add_parser("compare", help="Bandingkan dua file hasil")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("candidate")
+    compare_parser.add_argument("--threshold", type=float, default=0.10,
+                                help="Batas perubahan relatif sebelum dianggap regresi")
+
+    args = parser.parse_args(argv)
+    return run(args) if args.command == "run" else compare(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,197 @@
+"""
+Cache hasil query (memoization) dengan eviksi LRU berdasarkan jumlah entri
+dan perkiraan ukuran dalam byte.
+
+Kunci cache = (token versi dataset, nama fungsi, argumen). Token versi
+diberikan per DataFrame dan diganti dengan bump() setiap kali data dimuat
+atau diubah, sehingga hasil lama tidak pernah terbaca lagi untuk data baru.
+"""
+import collections
+import functools
+import inspect
+import itertools
+import sys
+import threading
+import weakref
+import numpy as np
+import pandas as pd
+import index
+
+DEFAULT_MAX_ENTRIES = 256
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+# Perkiraan byte per sel DataFrame (nilai 8 byte atau pointer ke string)
+_CELL_BYTES = 8
+
+_versions = itertools.count(1)
+
+
+def _new_version(data_frame):
+    token = next(_versions)
+    # Entri milik DataFrame yang sudah dibebaskan langsung dibuang dari cache
+    weakref.finalize(data_frame, _cache.discard, token)
+    return token
+
+
+def version(data_frame):
+    """Token versi DataFrame; baru untuk setiap DataFrame atau setelah bump()."""
+    return index.get_derived(data_frame, "version", _new_version)
+
+
+def bump(data_frame):
+    """Tandai data_frame berubah: entri cache lamanya dibuang dan tidak terpakai lagi."""
+    old = version(data_frame)
+    index.invalidate(data_frame, "version")
+    _cache.discard(old)
+    return version(data_frame)
+
+
+def sizeof(value):
+    """
+    Perkiraan kasar ukuran value dalam byte. Dihitung dari bentuk data
+    (baris x kolom) tanpa memeriksa isi, karena dipanggil untuk setiap hasil
+    yang masuk cache dan tidak boleh lebih mahal dari query-nya sendiri.
+    """
+    if isinstance(value, pd.DataFrame):
+        return (len(value.columns) + 1) * len(value) * _CELL_BYTES
+    if isinstance(value, pd.Series):
+        return 2 * len(value) * _CELL_BYTES
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return sys.getsizeof(value) + sum(sys.getsizeof(item) for item in value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(sys.getsizeof(k) + sizeof(v) for k, v in value.items())
+    if hasattr(value, "__dict__"):
+        # Objek biasa (misalnya PrefixIndex): jumlahkan atributnya satu tingkat
+        return sys.getsizeof(value) + sum(sizeof(v) for v in vars(value).values())
+    return sys.getsizeof(value)
+
+
+def _freeze(value):
+    # Argumen list/dict (misalnya daftar nama) dijadikan hashable untuk kunci
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, (set, frozenset)):
+        return frozenset(_freeze(v) for v in value)
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    return value
+
+
+class QueryCache:
+    """
+    LRU dengan dua batas: jumlah entri dan total byte. Entri yang lebih besar
+    dari max_bytes tidak disimpan sama sekali.
+    """
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = collections.OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, value):
+        if self.max_entries <= 0 or self.max_bytes <= 0:
+            # Cache dinonaktifkan: ukuran tidak perlu dihitung
+            return
+        size = sizeof(value)
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            if size > self.max_bytes:
+                return
+            self._entries[key] = (value, size)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._bytes -= evicted
+                self.evictions += 1
+
+    def discard(self, token):
+        """Buang semua entri milik satu token versi dataset."""
+        with self._lock:
+            for key in [k for k in self._entries if k[0] == token]:
+                self._bytes -= self._entries.pop(key)[1]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / total if total else 0.0,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+            }
+
+    def __len__(self):
+        return len(self._entries)
+
+
+_cache = QueryCache()
+
+
+def get_cache():
+    return _cache
+
+
+def configure(max_entries=None, max_bytes=None):
+    if max_entries is not None:
+        _cache.max_entries = max_entries
+    if max_bytes is not None:
+        _cache.max_bytes = max_bytes
+
+
+def stats():
+    return _cache.stats()
+
+
+def memoized(func):
+    """
+    Decorator untuk fungsi f(data_frame, ...). Hasil None tidak disimpan
+    supaya pesan error/info dari fungsi tetap muncul di pemanggilan berikutnya.
+    Hasil yang dikembalikan dipakai bersama; pemanggil tidak boleh mengubahnya.
+    """
+    name = f"{func.__module__}.{func.__qualname__}"
+    signature = inspect.signature(func)
+
+    @functools.wraps(func)
+    def wrapper(data_frame, *args, **kwargs):
+        try:
+            # Argumen dinormalisasi (default diisi) supaya f(df, 5) dan f(df, top_n=5) berbagi entri
+            bound = signature.bind(data_frame, *args, **kwargs)
+            bound.apply_defaults()
+            arguments = tuple(bound.arguments.items())[1:]
+            key = (version(data_frame), name, _freeze(arguments))
+            hash(key)
+        except TypeError:
+            return func(data_frame, *args, **kwargs)
+        missing = object()
+        result = _cache.get(key, missing)
+        if result is missing:
+            result = func(data_frame, *args, **kwargs)
+            if result is not None:
+                _cache.put(key, result)
+        return result
+    wrapper.uncached = func
+    return wrapper
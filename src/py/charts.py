@@ -0,0 +1,261 @@
+import numpy as np
+import pandas as pd
+import index
+import instrument
+
+CHART_TYPES = ("Histogram", "Per Posisi", "Per Klub", "Scatter")
+MAX_SCATTER_POINTS = 5000
+MAX_CLUBS = 15
+
+
+class ChartData:
+    """
+    Data chart yang dihitung sekali per DataFrame lalu disimpan: jumlah per
+    nilai (np.bincount) untuk kolom rating bilangan bulat per kolom/filter,
+    statistik distribusi per grup, dan sampel baris untuk scatter.
+    """
+    def __init__(self, data_frame):
+        self.data_frame = data_frame
+        self._value_counts = {}
+        self._group_stats = {}
+        self._sample = None
+
+    def forget_columns(self, columns):
+        """Buang hasil yang memakai kolom yang nilainya berubah (lihat index.invalidate_columns)."""
+        self._value_counts = {k: v for k, v in self._value_counts.items()
+                              if k[0] not in columns and k[1] not in columns}
+        self._group_stats = {k: v for k, v in self._group_stats.items()
+                             if k[0] not in columns and k[1] not in columns}
+
+    def _rows(self, filter_column=None, filter_value=None):
+        if filter_column is None or not filter_value:
+            return None
+        return index.get_lookup_index(self.data_frame).lookup(filter_column, filter_value)
+
+    def value_counts(self, column, filter_column=None, filter_value=None):
+        """(nilai unik terurut, jumlah) untuk kolom, opsional difilter Position/Club."""
+        key = (column, filter_column, index.fold_case(filter_value) if filter_value else None)
+        if key not in self._value_counts:
+            series = self.data_frame[column]
+            rows = self._rows(filter_column, filter_value)
+            values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+            if rows is not None:
+                values = values[rows]
+            values = values[~np.isnan(values)]
+            if len(values) and pd.api.types.is_integer_dtype(series.dtype):
+                low = int(values.min())
+                counts = np.bincount(values.astype(np.int64) - low)
+                present = np.flatnonzero(counts)
+                self._value_counts[key] = (present + low, counts[present])
+            else:
+                self._value_counts[key] = np.unique(values, return_counts=True)
+        return self._value_counts[key]
+
+    def histogram(self, column, bins=20, filter_column=None, filter_value=None):
+        values, counts = self.value_counts(column, filter_column, filter_value)
+        if len(values) == 0:
+            return np.zeros(bins, dtype=np.int64), np.linspace(0, 1, bins + 1)
+        # Setara np.histogram pada data mentah, tapi hanya atas nilai unik berbobot
+        hist, edges = np.histogram(values, bins=bins, weights=counts)
+        return hist.astype(np.int64), edges
+
+    def group_stats(self, column, by):
+        """Statistik boxplot (format Axes.bxp) per grup, dihitung dari histogram 2D."""
+        key = (column, by)
+        if key not in self._group_stats:
+            groups = self.data_frame[by]
+            if not isinstance(groups.dtype, pd.CategoricalDtype):
+                groups = groups.astype("category")
+            codes = groups.cat.codes.to_numpy()
+            values = self.data_frame[column].to_numpy(dtype=np.float64, na_value=np.nan)
+            valid = (codes >= 0) & ~np.isnan(values)
+            codes, values = codes[valid], values[valid]
+            stats = []
+            if len(values):
+                low = int(np.floor(values.min()))
+                width = int(np.ceil(values.max())) - low + 1
+                # Nilai dibulatkan ke bilangan bulat; rating FIFA memang bulat
+                flat = codes.astype(np.int64) * width + (np.rint(values).astype(np.int64) - low)
+                hist = np.bincount(flat, minlength=len(groups.cat.categories) * width)
+                hist = hist.reshape(-1, width)
+                sums = np.bincount(codes, weights=values, minlength=len(groups.cat.categories))
+                levels = np.arange(width) + low
+                for code, row in enumerate(hist):
+                    total = row.sum()
+                    if total == 0:
+                        continue
+                    cumulative = np.cumsum(row)
+                    q1, med, q3 = (levels[np.searchsorted(cumulative, q * total)] for q in (0.25, 0.5, 0.75))
+                    present = levels[row > 0]
+                    iqr = q3 - q1
+                    stats.append({
+                        "label": str(groups.cat.categories[code]),
+                        "mean": sums[code] / total, "med": med, "q1": q1, "q3": q3,
+                        "whislo": present[present >= q1 - 1.5 * iqr].min(),
+                        "whishi": present[present <= q3 + 1.5 * iqr].max(),
+                        "fliers": [], "count": int(total),
+                    })
+            self._group_stats[key] = stats
+        return self._group_stats[key]
+
+    def scatter_rows(self, max_points=MAX_SCATTER_POINTS):
+        # Sampel tetap (seed 0) supaya scatter konsisten di antara pembaruan
+        if self._sample is None or len(self._sample) != min(max_points, len(self.data_frame)):
+            n = len(self.data_frame)
+            if n <= max_points:
+                self._sample = np.arange(n)
+            else:
+                self._sample = np.sort(np.random.default_rng(0).choice(n, max_points, replace=False))
+        return self._sample
+
+
+def get_chart_data(data_frame):
+    return index.get_derived(data_frame, "charts", ChartData)
+
+
+class ChartView:
+    """
+    Satu Figure/Axes yang dipakai ulang. Histogram dan scatter diperbarui di
+    tempat (tinggi bar / offsets titik) tanpa membuat figure baru.
+    """
+    def __init__(self, data_frame, figsize=(6, 4)):
+        from matplotlib.figure import Figure
+        self.data = get_chart_data(data_frame)
+        self.figure = Figure(figsize=figsize)
+        self.ax = self.figure.add_subplot()
+        self._kind = None
+        self._artist = None
+
+    def set_data(self, data_frame):
+        """Pakai DataFrame lain (misalnya hasil reload); gambar ulang dengan memanggil chart lagi."""
+        self.data = get_chart_data(data_frame)
+
+    def _reset(self, kind):
+        if self._kind != kind:
+            self.ax.clear()
+            self._kind = kind
+            self._artist = None
+
+    def histogram(self, column="Overall", bins=20, filter_column=None, filter_value=None):
+        counts, edges = self.data.histogram(column, bins, filter_column, filter_value)
+        self._reset("hist")
+        if self._artist is not None and len(self._artist.patches) == len(counts):
+            for patch, x, w, h in zip(self._artist.patches, edges[:-1], np.diff(edges), counts):
+                patch.set_x(x)
+                patch.set_width(w)
+                patch.set_height(h)
+            self.ax.relim()
+            self.ax.autoscale_view()
+        else:
+            self.ax.clear()
+            self._artist = self.ax.bar(edges[:-1], counts, width=np.diff(edges), align="edge",
+                                       color="skyblue", edgecolor="black")
+        title = f"Distribusi {column}"
+        if filter_value:
+            title += f" ({filter_column}: {filter_value})"
+        self.ax.set_title(title)
+        self.ax.set_xlabel(column)
+        self.ax.set_ylabel("Frequency")
+
+    def grouped(self, column="Overall", by="Position", max_groups=None):
+        stats = self.data.group_stats(column, by)
+        if max_groups is not None and len(stats) > max_groups:
+            stats = sorted(stats, key=lambda s: s["mean"], reverse=True)[:max_groups]
+        self._reset(("box", by))
+        self.ax.clear()
+        if stats:
+            self.ax.bxp(stats, showfliers=False, showmeans=True)
+            self.ax.tick_params(axis="x", labelrotation=90 if by == "Club" else 0)
+        self.ax.set_title(f"Distribusi {column} per {by}")
+        self.ax.set_ylabel(column)
+        self.figure.tight_layout()
+
+    def scatter(self, x_column="Pace", y_column="Shooting", max_points=MAX_SCATTER_POINTS):
+        rows = self.data.scatter_rows(max_points)
+        frame = self.data.data_frame
+        points = np.column_stack([
+            frame[x_column].to_numpy(dtype=np.float64, na_value=np.nan)[rows],
+            frame[y_column].to_numpy(dtype=np.float64, na_value=np.nan)[rows],
+        ])
+        self._reset("scatter")
+        if self._artist is not None:
+            self._artist.set_offsets(points)
+            self.ax.relim()
+            self.ax.update_datalim(points[~np.isnan(points).any(axis=1)])
+            self.ax.autoscale_view()
+        else:
+            self._artist = self.ax.scatter(points[:, 0], points[:, 1], s=6, alpha=0.4, color="steelblue")
+        note = f" (sampel {len(rows)} dari {len(frame)})" if len(rows) < len(frame) else ""
+        self.ax.set_title(f"{y_column} vs {x_column}{note}")
+        self.ax.set_xlabel(x_column)
+        self.ax.set_ylabel(y_column)
+
+    def close(self):
+        self.figure.clear()
+        self._artist = None
+
+
+def open_chart_window(master, data_frame):
+    """Jendela Visual Data dengan pilihan jenis chart; figure ditutup saat jendela ditutup."""
+    import tkinter as tk
+    from tkinter import ttk
+    from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+
+    window = tk.Toplevel(master)
+    window.title("Visual Data")
+    view = ChartView(data_frame)
+
+    numeric_columns = [c for c in data_frame.columns if pd.api.types.is_numeric_dtype(data_frame[c])]
+    positions = sorted(data_frame['Position'].dropna().unique().tolist()) \
+        if 'Position' in data_frame.columns else []
+
+    controls = ttk.Frame(window)
+    controls.pack(side=tk.TOP, fill=tk.X, padx=10, pady=5)
+    kind_var = tk.StringVar(value=CHART_TYPES[0])
+    column_var = tk.StringVar(value="Overall")
+    y_var = tk.StringVar(value="Shooting" if "Shooting" in numeric_columns else "Overall")
+    position_var = tk.StringVar(value="")
+    ttk.Combobox(controls, textvariable=kind_var, values=CHART_TYPES, state="readonly", width=12)\
+        .grid(row=0, column=0, padx=5)
+    ttk.Combobox(controls, textvariable=column_var, values=numeric_columns, state="readonly", width=14)\
+        .grid(row=0, column=1, padx=5)
+    y_combo = ttk.Combobox(controls, textvariable=y_var, values=numeric_columns, state="readonly", width=14)
+    y_combo.grid(row=0, column=2, padx=5)
+    position_combo = ttk.Combobox(controls, textvariable=position_var, values=[""] + positions,
+                                  state="readonly", width=8)
+    position_combo.grid(row=0, column=3, padx=5)
+
+    canvas = FigureCanvasTkAgg(view.figure, master=window)
+    canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+
+    @instrument.traced(name="Render Chart")
+    def render(*args):
+        kind = kind_var.get()
+        y_combo.config(state="readonly" if kind == "Scatter" else "disabled")
+        position_combo.config(state="readonly" if kind == "Histogram" else "disabled")
+        if kind == "Histogram":
+            view.histogram(column_var.get(), filter_column="Position", filter_value=position_var.get())
+        elif kind == "Per Posisi":
+            view.grouped(column_var.get(), "Position")
+        elif kind == "Per Klub":
+            view.grouped(column_var.get(), "Club", max_groups=MAX_CLUBS)
+        else:
+            view.scatter(column_var.get(), y_var.get())
+        with instrument.stage("draw"):
+            canvas.draw()
+
+    for var in (kind_var, column_var, y_var, position_var):
+        var.trace_add("write", render)
+
+    def set_data(data_frame):
+        view.set_data(data_frame)
+        render()
+    window.set_data = set_data
+
+    def on_destroy(event):
+        if event.widget is window:
+            view.close()
+    window.bind("<Destroy>", on_destroy, add="+")
+
+    render()
+    return window
@@ -0,0 +1,134 @@
+import os
+import numpy as np
+import instrument
+
+GROUP_COLUMNS = ("Club", "Nation", "Position", "Gender")
+GROUP_STATS = ("count", "mean", "std", "min", "median", "max")
+FORMATS = {".xlsx": "xlsx", ".csv": "csv", ".parquet": "parquet"}
+
+
+class ExportError(Exception):
+    pass
+
+
+class ExportCancelled(Exception):
+    pass
+
+
+def _check_cancel(cancel_event):
+    if cancel_event is not None and cancel_event.is_set():
+        raise ExportCancelled("Ekspor summary dibatalkan.")
+
+
+def grouped_summary(data_frame, by=None):
+    """
+    Summary kolom numerik. Tanpa by hasilnya sama dengan describe(); dengan by
+    (misalnya 'Club') semua statistik dihitung dalam satu groupby-agg dan
+    kolomnya diratakan menjadi '<kolom> <statistik>'.
+    """
+    if by is None:
+        return data_frame.describe().rename_axis("stat")
+    if by not in data_frame.columns:
+        raise ExportError(f"Kolom '{by}' tidak ditemukan dalam data.")
+    numeric = data_frame.select_dtypes(include="number")
+    # Rating int8 di-upcast agar mean/std tidak dihitung dengan presisi rendah
+    numeric = numeric.astype({c: np.float64 for c in numeric.columns})
+    result = numeric.groupby(data_frame[by], observed=True).agg(list(GROUP_STATS))
+    result.columns = [f"{col} {stat}" for col, stat in result.columns]
+    return result
+
+
+def _format_for(path):
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".xls":
+        raise ExportError("Format .xls tidak didukung; gunakan .xlsx, .csv atau .parquet.")
+    if ext not in FORMATS:
+        raise ExportError(f"Format file tidak dikenal: {ext or '(tanpa ekstensi)'}")
+    return FORMATS[ext]
+
+
+def _sheet_name(group):
+    return "Total" if group is None else group
+
+
+def _group_path(path, group, first):
+    # File pertama memakai path yang dipilih; grup lain mendapat akhiran nama grup
+    if first:
+        return path
+    stem, ext = os.path.splitext(path)
+    return f"{stem}_{_sheet_name(group).lower()}{ext}"
+
+
+def _cell(value):
+    if value is None or (isinstance(value, float) and np.isnan(value)):
+        return None
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def _write_xlsx(path, frames, progress, cancel_event):
+    try:
+        from openpyxl import Workbook
+    except ImportError:
+        raise ExportError("Paket openpyxl dibutuhkan untuk menulis file .xlsx.")
+    # Mode write-only menulis baris secara streaming tanpa menyimpan sel di memori
+    workbook = Workbook(write_only=True)
+    total_rows = max(sum(len(frame) for _, frame in frames), 1)
+    written = 0
+    for group, frame in frames:
+        sheet = workbook.create_sheet(_sheet_name(group)[:31])
+        sheet.append([frame.index.name or ""] + [str(c) for c in frame.columns])
+        for label, row in zip(frame.index, frame.itertuples(index=False, name=None)):
+            sheet.append([_cell(label)] + [_cell(v) for v in row])
+            written += 1
+            if written % 500 == 0:
+                _check_cancel(cancel_event)
+                if progress is not None:
+                    progress(written / total_rows)
+    workbook.save(path)
+    return [path]
+
+
+def _write_files(path, frames, fmt, progress, cancel_event):
+    paths = []
+    for i, (group, frame) in enumerate(frames):
+        _check_cancel(cancel_event)
+        target = _group_path(path, group, i == 0)
+        if fmt == "csv":
+            frame.to_csv(target)
+        else:
+            try:
+                frame.reset_index().to_parquet(target, index=False)
+            except ImportError:
+                raise ExportError("Paket pyarrow atau fastparquet dibutuhkan untuk menulis file .parquet.")
+        paths.append(target)
+        if progress is not None:
+            progress((i + 1) / len(frames))
+    return paths
+
+
+@instrument.traced
+def export_summary(data_frame, path, groups=(None,), progress=None, cancel_event=None):
+    """
+    Hitung summary untuk tiap grup (None = seluruh data) dan tulis ke path.
+    .xlsx: satu sheet per grup (streaming/write-only); .csv dan .parquet: satu
+    file per grup. Mengembalikan daftar file yang ditulis.
+    """
+    fmt = _format_for(path)
+    frames = []
+    for i, group in enumerate(groups):
+        _check_cancel(cancel_event)
+        with instrument.stage(f"summary {group or 'total'}") as record:
+            frames.append((group, grouped_summary(data_frame, group)))
+            record.set_rows(len(frames[-1][1]))
+        if progress is not None:
+            # Perhitungan dianggap separuh pekerjaan, penulisan separuh sisanya
+            progress(0.5 * (i + 1) / len(groups))
+    write_progress = None if progress is None else (lambda frac: progress(0.5 + 0.5 * frac))
+    with instrument.stage(f"write {fmt}"):
+        if fmt == "xlsx":
+            paths = _write_xlsx(path, frames, write_progress, cancel_event)
+        else:
+            paths = _write_files(path, frames, fmt, write_progress, cancel_event)
+    if progress is not None:
+        progress(1.0)
+    return paths
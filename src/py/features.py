@@ -1,72 +1,223 @@
 import pandas as pd
-import matplotlib.pyplot as plt
-from tkinter import messagebox, Toplevel
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+import numpy as np
+import index
+import ranking
+import similar
+import charts
+import instrument
+import cache
+import search
+import query as query_engine
+import squad
 
+def _messagebox_notify(kind, title, message):
+    # tkinter diimpor saat dibutuhkan supaya modul ini bisa dipakai tanpa GUI
+    from tkinter import messagebox
+    getattr(messagebox, "show" + kind)(title, message)
+
+_notify = _messagebox_notify
+
+def set_notifier(notifier):
+    """
+    Ganti cara pesan error/info ditampilkan. notifier(kind, title, message)
+    dengan kind "error" atau "info"; None mengembalikan ke messagebox Tk.
+    """
+    global _notify
+    _notify = notifier if notifier is not None else _messagebox_notify
+
+def prepare(data_frame):
+    # Bangun indeks sekali saat data dimuat agar lookup berikutnya O(1)
+    index.get_lookup_index(data_frame)
+    ranking.get_ranking_engine(data_frame)
+    similar.get_similarity_index(data_frame)
+
+@instrument.traced
+@cache.memoized
 def info_player(data_frame, player_name):
     if 'Name' not in data_frame.columns:
-        messagebox.showerror("Error", "Kolom 'Name' tidak ditemukan dalam data.")
+        _notify("error", "Error", "Kolom 'Name' tidak ditemukan dalam data.")
         return None
-    result = data_frame[data_frame['Name'].str.lower() == player_name.lower()]
-    if result.empty:
+    positions = index.get_lookup_index(data_frame).lookup('Name', player_name)
+    if len(positions) == 0:
         return None
-    return result.iloc[0].to_dict()
+    return data_frame.iloc[positions[0]].to_dict()
 
+@instrument.traced
+@cache.memoized
 def info_team(data_frame, team_name):
     if 'Club' not in data_frame.columns:
-        messagebox.showerror("Error", "Kolom 'Club' tidak ditemukan dalam data.")
+        _notify("error", "Error", "Kolom 'Club' tidak ditemukan dalam data.")
         return None
-    result = data_frame[data_frame['Club'].str.lower() == team_name.lower()]
-    if result.empty:
+    positions = index.get_lookup_index(data_frame).lookup('Club', team_name)
+    if len(positions) == 0:
         return None
-    return result
+    return data_frame.iloc[positions]
 
+@instrument.traced
+@cache.memoized
 def summary(data_frame):
     return data_frame.describe()
 
-def top_player(data_frame, top_n=5):
-    if 'Overall' not in data_frame.columns:
-        messagebox.showerror("Error", "Kolom 'Overall' tidak ditemukan dalam data.")
+def _check_metric(data_frame, metric):
+    missing = [col for col in ranking.metric_columns(metric) if col not in data_frame.columns]
+    if missing:
+        _notify("error", "Error", f"Kolom {', '.join(repr(c) for c in missing)} tidak ditemukan dalam data.")
+        return False
+    return True
+
+@instrument.traced
+@cache.memoized
+def top_player(data_frame, top_n=5, metric='Overall'):
+    if not _check_metric(data_frame, metric):
         return None
-    sorted_df = data_frame.sort_values(by='Overall', ascending=False)
-    return sorted_df.head(top_n)
+    positions = ranking.get_ranking_engine(data_frame).top_players(top_n, metric)
+    return data_frame.iloc[positions]
 
-def top_player_by_position(data_frame, position, top_n=5):
+@instrument.traced
+@cache.memoized
+def top_player_by_position(data_frame, position, top_n=5, metric='Overall'):
     if 'Position' not in data_frame.columns:
-        messagebox.showerror("Error", "Kolom 'Position' tidak ditemukan dalam data.")
+        _notify("error", "Error", "Kolom 'Position' tidak ditemukan dalam data.")
         return None
-    subset = data_frame[data_frame['Position'].str.lower() == position.lower()]
-    if subset.empty:
-        messagebox.showinfo("Info", f"Tidak ada pemain dengan posisi {position}.")
+    if len(index.get_lookup_index(data_frame).lookup('Position', position)) == 0:
+        _notify("info", "Info", f"Tidak ada pemain dengan posisi {position}.")
         return None
-    if 'Overall' not in subset.columns:
-        messagebox.showerror("Error", "Kolom 'Overall' tidak ditemukan dalam data.")
+    if not _check_metric(data_frame, metric):
         return None
-    sorted_subset = subset.sort_values(by='Overall', ascending=False)
-    return sorted_subset.head(top_n)
+    positions = ranking.get_ranking_engine(data_frame).top_players(top_n, metric, position)
+    return data_frame.iloc[positions]
 
-def top_team(data_frame, top_n=5):
-    if 'Club' not in data_frame.columns or 'Overall' not in data_frame.columns:
-        messagebox.showerror("Error", "Kolom 'Club' atau 'Overall' tidak ditemukan dalam data.")
+@instrument.traced
+@cache.memoized
+def top_team(data_frame, top_n=5, metric='Overall', min_squad=1):
+    if 'Club' not in data_frame.columns:
+        _notify("error", "Error", "Kolom 'Club' tidak ditemukan dalam data.")
+        return None
+    if not _check_metric(data_frame, metric):
         return None
-    group = data_frame.groupby('Club')['Overall'].mean().reset_index()
-    group = group.sort_values(by='Overall', ascending=False)
-    return group.head(top_n)
+    return ranking.get_ranking_engine(data_frame).top_teams(top_n, metric, min_squad)
 
+@instrument.traced
+def similar_players_batch(data_frame, player_names, top_n=10, metric='cosine', positions=None):
+    """
+    Pemain paling mirip untuk banyak pemain sekaligus. Mengembalikan dict
+    nama -> DataFrame (None jika pemain tidak ditemukan). Tidak di-cache:
+    hasil batch besar dan jarang diulang persis sama; similar_players() di-cache.
+    """
+    if 'Name' not in data_frame.columns:
+        _notify("error", "Error", "Kolom 'Name' tidak ditemukan dalam data.")
+        return None
+    lookup = index.get_lookup_index(data_frame)
+    engine = similar.get_similarity_index(data_frame)
+    found = {}
+    for name in player_names:
+        rows = lookup.lookup('Name', name)
+        if len(rows):
+            found[name] = rows[0]
+    results = {name: None for name in player_names}
+    if not found:
+        return results
+    neighbors, scores = engine.query(list(found.values()), top_n, metric, engine.mask_for(positions))
+    # Satu take untuk semua tetangga, lalu dipotong per pemain. Take-nya murah;
+    # yang dominan (setelah query kNN) adalah membuat satu DataFrame per pemain
+    # lewat iloc[start:end], tetap jauh lebih murah daripada iloc fancy per pemain
+    valid = neighbors >= 0
+    combined = data_frame.iloc[neighbors[valid]].copy()
+    combined.insert(0, 'Similarity' if metric == 'cosine' else 'Distance', scores[valid])
+    ends = np.cumsum(valid.sum(axis=1))
+    for name, start, end in zip(found, np.r_[0, ends[:-1]], ends):
+        results[name] = combined.iloc[start:end]
+    return results
+
+@cache.memoized
+def similar_players(data_frame, player_name, top_n=10, metric='cosine', positions=None):
+    results = similar_players_batch(data_frame, [player_name], top_n, metric, positions)
+    return None if results is None else results[player_name]
+
+@instrument.traced
+@cache.memoized
+def histogram(data_frame, column='Overall', bins=20):
+    if column not in data_frame.columns:
+        _notify("error", "Error", f"Kolom '{column}' tidak ditemukan dalam data.")
+        return None
+    counts, edges = np.histogram(data_frame[column].dropna().to_numpy(dtype=np.float64), bins=bins)
+    return pd.DataFrame({'bin_start': edges[:-1], 'bin_end': edges[1:], 'count': counts})
+
+@instrument.traced
+@cache.memoized
+def query(data_frame, text):
+    """
+    Jalankan query majemuk (teks atau query.Query), misalnya
+    "Nation = Brazil AND Position IN {ST, CF} AND Age < 23 ORDER BY Overall DESC".
+    """
+    try:
+        parsed = query_engine.parse(text) if isinstance(text, str) else text
+        rows = query_engine.get_query_engine(data_frame).run(parsed)
+    except query_engine.FilterError as e:
+        _notify("error", "Error", str(e))
+        return None
+    return data_frame.iloc[rows]
+
+@instrument.traced
+@cache.memoized
+def best_xi(data_frame, formation=squad.DEFAULT_FORMATION, club=None, nation=None, metric='Overall'):
+    """
+    Best XI untuk formasi dari satu klub, satu negara, atau seluruh pemain
+    (club dan nation kosong). Mengembalikan DataFrame dengan kolom Slot dan Fit.
+    """
+    if 'Position' not in data_frame.columns:
+        _notify("error", "Error", "Kolom 'Position' tidak ditemukan dalam data.")
+        return None
+    if not _check_metric(data_frame, metric):
+        return None
+    if formation not in squad.FORMATIONS:
+        _notify("error", "Error", f"Formasi tidak dikenal: {formation}")
+        return None
+    rows = None
+    engine = query_engine.get_query_engine(data_frame)
+    for column, value in (('Club', club), ('Nation', nation)):
+        if not value:
+            continue
+        if column not in data_frame.columns:
+            _notify("error", "Error", f"Kolom '{column}' tidak ditemukan dalam data.")
+            return None
+        mask = engine.mask(query_engine.Condition(column, "=", value))
+        rows = np.flatnonzero(mask) if rows is None else np.intersect1d(rows, np.flatnonzero(mask))
+        if len(rows) == 0:
+            _notify("info", "Info", f"Tidak ada pemain untuk {column} {value}.")
+            return None
+    return squad.get_squad_builder(data_frame).lineup(formation, rows, metric)
+
+@instrument.traced
+@cache.memoized
+def top_team_xi(data_frame, top_n=10, formation=squad.DEFAULT_FORMATION, by='Club', metric='Overall'):
+    """Peringkat semua klub (atau negara dengan by='Nation') berdasarkan kekuatan best XI."""
+    if by not in data_frame.columns or 'Position' not in data_frame.columns:
+        _notify("error", "Error", f"Kolom '{by}' atau 'Position' tidak ditemukan dalam data.")
+        return None
+    if not _check_metric(data_frame, metric):
+        return None
+    if formation not in squad.FORMATIONS:
+        _notify("error", "Error", f"Formasi tidak dikenal: {formation}")
+        return None
+    return squad.get_squad_builder(data_frame).top_groups(by, top_n, formation, metric)
+
+@cache.memoized
+def unique_values(data_frame, column):
+    """Nilai unik kolom, terurut; dipakai untuk daftar pilihan combobox."""
+    if column not in data_frame.columns:
+        return None
+    return sorted(data_frame[column].dropna().unique().tolist())
+
+@cache.memoized
+def completion_index(data_frame, column):
+    """PrefixIndex autocomplete untuk kolom (Name, Club, Position)."""
+    values = unique_values(data_frame, column)
+    return None if values is None else search.PrefixIndex(values)
+
+@instrument.traced
 def visual_data(data_frame, master):
-    window = Toplevel(master)
-    window.title("Visual Data")
-    
     if 'Overall' not in data_frame.columns:
-        messagebox.showerror("Error", "Kolom 'Overall' tidak ditemukan dalam data.")
-        return
-    
-    fig, ax = plt.subplots(figsize=(6, 4))
-    ax.hist(data_frame['Overall'].dropna(), bins=20, color='skyblue', edgecolor='black')
-    ax.set_title("Distribusi Overall Rating")
-    ax.set_xlabel("Overall Rating")
-    ax.set_ylabel("Frequency")
-    
-    canvas = FigureCanvasTkAgg(fig, master=window)
-    canvas.draw()
-    canvas.get_tk_widget().pack()
\ No newline at end of file
+        _notify("error", "Error", "Kolom 'Overall' tidak ditemukan dalam data.")
+        return None
+    return charts.open_chart_window(master, data_frame)
@@ -0,0 +1,305 @@
+"""
+Command-line FIFA Data Viewer tanpa GUI.
+
+Contoh (jalankan dari folder src/py):
+    python -m fifa --data ../../data/male_players.csv player "Kylian Mbappe"
+    python -m fifa --data ../../data/male_players.csv top-player --position ST -n 10
+    python -m fifa --data ../../data/male_players.csv query "Nation = Brazil AND Age < 23 ORDER BY Overall DESC LIMIT 20"
+    python -m fifa --data ../../data/male_players.csv --format csv batch queries.txt
+    python -m fifa --data ../../data/male_players.csv --stream top-team -n 10
+    python -m fifa --data "../../data/*.csv" --jobs 4 top-team -n 10
+
+Dengan --stream, CSV dibaca per chunk dengan memori terbatas (untuk file yang
+lebih besar dari RAM); hanya summary, top-team dan top-player (metrik Overall)
+yang didukung. --data juga menerima folder atau pola glob: file-file dimuat
+paralel (kolom Source dan Season ditambahkan), dan dengan --stream tiap file
+diagregasi di proses terpisah lalu hasilnya digabung.
+
+File batch berisi satu query per baris dengan sintaks yang sama seperti
+subcommand (misalnya `team "Real Madrid"`); baris kosong dan baris yang
+diawali '#' diabaikan.
+"""
+import argparse
+import json
+import shlex
+import sys
+import time
+import pandas as pd
+import load
+import features
+import stream
+import export
+import squad
+
+
+class QueryError(Exception):
+    pass
+
+
+def _raise_notifier(kind, title, message):
+    raise QueryError(message)
+
+
+def _add_query_commands(subparsers):
+    player = subparsers.add_parser("player", help="Info satu pemain")
+    player.add_argument("name")
+
+    team = subparsers.add_parser("team", help="Semua pemain dalam satu tim")
+    team.add_argument("name")
+
+    top_player = subparsers.add_parser("top-player", help="Pemain dengan rating tertinggi")
+    top_player.add_argument("--position")
+    top_player.add_argument("-n", "--top-n", type=int, default=5)
+    top_player.add_argument("--metric", default="Overall")
+
+    top_team = subparsers.add_parser("top-team", help="Tim dengan rata-rata rating tertinggi")
+    top_team.add_argument("-n", "--top-n", type=int, default=5)
+    top_team.add_argument("--metric", default="Overall")
+    top_team.add_argument("--min-squad", type=int, default=1)
+
+    summary = subparsers.add_parser("summary", help="Statistik ringkasan (describe)")
+    summary.add_argument("--by", choices=export.GROUP_COLUMNS, help="Summary per grup")
+
+    histogram = subparsers.add_parser("histogram", help="Distribusi nilai satu kolom")
+    histogram.add_argument("--column", default="Overall")
+    histogram.add_argument("--bins", type=int, default=20)
+
+    best_xi = subparsers.add_parser("best-xi", help="Best XI per formasi dari klub, negara atau semua pemain")
+    best_xi.add_argument("--formation", choices=squad.FORMATIONS, default=squad.DEFAULT_FORMATION)
+    best_xi.add_argument("--club")
+    best_xi.add_argument("--nation")
+    best_xi.add_argument("--metric", default="Overall")
+
+    top_xi = subparsers.add_parser("top-xi", help="Peringkat klub/negara berdasarkan kekuatan best XI")
+    top_xi.add_argument("-n", "--top-n", type=int, default=10)
+    top_xi.add_argument("--formation", choices=squad.FORMATIONS, default=squad.DEFAULT_FORMATION)
+    top_xi.add_argument("--by", choices=("Club", "Nation"), default="Club")
+    top_xi.add_argument("--metric", default="Overall")
+
+    query = subparsers.add_parser("query", help="Filter majemuk, misalnya 'Age < 23 AND Pace >= 85'")
+    query.add_argument("text", help="Kondisi digabung AND, opsional ORDER BY dan LIMIT")
+
+
+class _QueryParser(argparse.ArgumentParser):
+    """
+    Parser untuk baris file batch: kesalahan argumen menjadi QueryError untuk
+    baris itu saja, tanpa menulis usage ke stderr atau menghentikan batch.
+    Subparser otomatis memakai kelas yang sama.
+    """
+    def error(self, message):
+        raise QueryError(f"{self.prog}: {message}")
+
+    def exit(self, status=0, message=None):
+        raise QueryError(message.strip() if message else f"{self.prog}: perintah dihentikan")
+
+
+def build_query_parser():
+    parser = _QueryParser(prog="query", add_help=False)
+    _add_query_commands(parser.add_subparsers(dest="command", required=True))
+    return parser
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m fifa", description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--data", default=None,
+                        help="File CSV, folder, atau pola glob seperti 'data/*.csv' (default: data/data.csv)")
+    parser.add_argument("--jobs", type=int, default=None,
+                        help="Jumlah proses untuk memuat banyak file (default: jumlah core)")
+    parser.add_argument("--format", choices=("json", "csv"), default="json")
+    parser.add_argument("--no-cache", action="store_true", help="Jangan pakai cache biner")
+    parser.add_argument("--stream", action="store_true",
+                        help="Agregasi per chunk tanpa memuat seluruh CSV ke memori")
+    parser.add_argument("--chunksize", type=int, default=None)
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    _add_query_commands(subparsers)
+    batch = subparsers.add_parser("batch", help="Jalankan semua query dalam file")
+    batch.add_argument("file", help="File query, atau '-' untuk stdin")
+    return parser
+
+
+def run_query(data_frame, args):
+    """Jalankan satu query; hasilnya selalu DataFrame (bisa kosong)."""
+    if args.command == "player":
+        info = features.info_player(data_frame, args.name)
+        return pd.DataFrame([info]) if info is not None else pd.DataFrame()
+    if args.command == "team":
+        result = features.info_team(data_frame, args.name)
+    elif args.command == "top-player":
+        if args.position:
+            result = features.top_player_by_position(data_frame, args.position, args.top_n, args.metric)
+        else:
+            result = features.top_player(data_frame, args.top_n, args.metric)
+    elif args.command == "top-team":
+        result = features.top_team(data_frame, args.top_n, args.metric, args.min_squad)
+    elif args.command == "summary":
+        try:
+            result = export.grouped_summary(data_frame, args.by).reset_index()
+        except export.ExportError as e:
+            raise QueryError(str(e))
+    elif args.command == "histogram":
+        result = features.histogram(data_frame, args.column, args.bins)
+    elif args.command == "best-xi":
+        result = features.best_xi(data_frame, args.formation, args.club, args.nation, args.metric)
+    elif args.command == "top-xi":
+        result = features.top_team_xi(data_frame, args.top_n, args.formation, args.by, args.metric)
+    elif args.command == "query":
+        result = features.query(data_frame, args.text)
+    else:
+        raise QueryError(f"Perintah tidak dikenal: {args.command}")
+    return result if result is not None else pd.DataFrame()
+
+
+STREAM_COMMANDS = ("summary", "top-team", "top-player")
+
+
+def run_stream_query(aggregator, args):
+    """Jalankan satu query terhadap StreamingAggregator."""
+    if args.command not in STREAM_COMMANDS:
+        raise QueryError(f"Perintah '{args.command}' tidak didukung dalam mode --stream.")
+    if getattr(args, "metric", aggregator.metric) != aggregator.metric:
+        raise QueryError(f"Mode --stream hanya mendukung metrik {aggregator.metric}.")
+    if args.command == "summary":
+        if args.by is not None:
+            raise QueryError("Mode --stream tidak mendukung summary --by.")
+        return aggregator.summary().rename_axis("stat").reset_index()
+    if args.command == "top-team":
+        return aggregator.top_team(args.top_n, args.min_squad)
+    result = aggregator.top_player(args.top_n, args.position)
+    if result is None or result.empty:
+        raise QueryError(f"Tidak ada pemain dengan posisi {args.position}.")
+    return result
+
+
+def _stream_top_n(args, queries, default=5):
+    # Top-N yang disimpan selama streaming harus mencakup n terbesar yang diminta
+    if queries is None:
+        return max(default, getattr(args, "top_n", default))
+    parser = build_query_parser()
+    top_n = default
+    for query in queries:
+        try:
+            top_n = max(top_n, getattr(parser.parse_args(shlex.split(query)), "top_n", default))
+        except (argparse.ArgumentError, ValueError, SystemExit):
+            pass
+    return top_n
+
+
+def _read_batch(path):
+    stream = sys.stdin if path == "-" else open(path, "r", encoding="utf-8")
+    try:
+        lines = [line.strip() for line in stream]
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+    return [line for line in lines if line and not line.startswith("#")]
+
+
+def run_batch(data_frame, queries, runner=run_query):
+    """Jalankan daftar query (string) dan kembalikan hasil beserta waktu per query."""
+    parser = build_query_parser()
+    results = []
+    for query in queries:
+        start = time.perf_counter()
+        try:
+            args = parser.parse_args(shlex.split(query))
+            frame, error = runner(data_frame, args), None
+        except (QueryError, ValueError) as e:
+            frame, error = None, str(e)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        results.append({"query": query, "elapsed_ms": elapsed_ms, "frame": frame, "error": error})
+    return results
+
+
+def _frame_records(frame):
+    return json.loads(frame.to_json(orient="records", force_ascii=False))
+
+
+def write_json(results, load_ms, out):
+    payload = {
+        "load_ms": round(load_ms, 3),
+        "results": [
+            {
+                "query": r["query"],
+                "elapsed_ms": round(r["elapsed_ms"], 3),
+                "error": r["error"],
+                "rows": _frame_records(r["frame"]) if r["frame"] is not None else [],
+            }
+            for r in results
+        ],
+    }
+    json.dump(payload, out, ensure_ascii=False, indent=2)
+    out.write("\n")
+
+
+def write_csv(results, load_ms, out, err):
+    err.write(f"load\t{load_ms:.3f} ms\n")
+    for i, r in enumerate(results):
+        err.write(f"{r['query']}\t{r['elapsed_ms']:.3f} ms\n")
+        if len(results) > 1:
+            if i:
+                out.write("\n")
+            out.write(f"# {r['query']}\n")
+        if r["error"] is not None:
+            err.write(f"Error: {r['error']}\n")
+        elif r["frame"] is not None:
+            r["frame"].to_csv(out, index=False)
+
+
+def main(argv=None, out=None, err=None):
+    out = out or sys.stdout
+    err = err or sys.stderr
+    argv = sys.argv[1:] if argv is None else list(argv)
+    args = build_parser().parse_args(argv)
+
+    if args.command == "batch":
+        queries = _read_batch(args.file)
+    else:
+        queries = None
+
+    runner = run_stream_query if args.stream else run_query
+
+    features.set_notifier(_raise_notifier)
+    try:
+        start = time.perf_counter()
+        try:
+            sources = load.expand_sources(args.data or load.DEFAULT_FILE_PATH)
+            if args.stream:
+                # Banyak file diagregasi paralel per file lalu digabung (map-reduce)
+                data_frame = stream.aggregate_files(sources, top_n=_stream_top_n(args, queries),
+                                                    chunksize=args.chunksize, processes=args.jobs)
+            elif len(sources) > 1:
+                data_frame = load.load_many(sources, processes=args.jobs, use_cache=not args.no_cache,
+                                            chunksize=args.chunksize)
+                features.prepare(data_frame)
+            else:
+                data_frame = load.load_csv_data(sources[0], use_cache=not args.no_cache,
+                                                chunksize=args.chunksize)
+                features.prepare(data_frame)
+        except Exception as e:
+            err.write(f"Error: {e}\n")
+            return 2
+        load_ms = (time.perf_counter() - start) * 1000
+
+        if queries is None:
+            start = time.perf_counter()
+            try:
+                frame, error = runner(data_frame, args), None
+            except QueryError as e:
+                frame, error = None, str(e)
+            label = shlex.join(argv[argv.index(args.command):])
+            results = [{"query": label, "elapsed_ms": (time.perf_counter() - start) * 1000,
+                        "frame": frame, "error": error}]
+        else:
+            results = run_batch(data_frame, queries, runner)
+    finally:
+        features.set_notifier(None)
+
+    if args.format == "json":
+        write_json(results, load_ms, out)
+    else:
+        write_csv(results, load_ms, out, err)
+    return 1 if any(r["error"] is not None for r in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,129 @@
+import unicodedata
+import weakref
+import numpy as np
+import pandas as pd
+
+# Struktur turunan (indeks, cache, dll.) per DataFrame, disimpan berdasarkan id()
+# dan otomatis dibuang saat DataFrame-nya dibebaskan dari memori
+_derived = {}
+
+
+def get_derived(data_frame, key, builder):
+    entry = _derived.get(id(data_frame))
+    if entry is None:
+        entry = {}
+        _derived[id(data_frame)] = entry
+        weakref.finalize(data_frame, _derived.pop, id(data_frame), None)
+    if key not in entry:
+        entry[key] = builder(data_frame)
+    return entry[key]
+
+
+def invalidate(data_frame, key=None):
+    entry = _derived.get(id(data_frame))
+    if entry is None:
+        return
+    if key is None:
+        entry.clear()
+    else:
+        entry.pop(key, None)
+
+
+def invalidate_columns(data_frame, columns):
+    """
+    Nilai beberapa kolom data_frame diubah di tempat. Struktur turunan yang
+    punya forget_columns() membuang bagian yang terkait saja; yang menyatakan
+    depends_on dan tidak bersinggungan dengan kolom tersebut dipertahankan;
+    sisanya dibuang dan dibangun ulang saat dibutuhkan.
+    """
+    entry = _derived.get(id(data_frame))
+    if entry is None:
+        return
+    columns = set(columns)
+    for key, value in list(entry.items()):
+        if key == "version":
+            # Token versi cache dikelola cache.bump(), bukan per kolom
+            continue
+        if hasattr(value, "forget_columns"):
+            value.forget_columns(columns)
+        elif getattr(value, "depends_on", None) is None or columns & set(value.depends_on):
+            del entry[key]
+
+
+def fold_case(text):
+    return str(text).casefold()
+
+
+def fold_accents(text):
+    """Casefold dan hilangkan aksen, misalnya 'Mbappé' -> 'mbappe'."""
+    decomposed = unicodedata.normalize("NFKD", str(text).casefold())
+    return "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+
+
+class ColumnIndex:
+    """
+    Pemetaan kunci (case-insensitive dan accent-insensitive) ke posisi baris
+    untuk satu kolom. Pencocokan case-insensitive diutamakan, baru kemudian
+    pencocokan tanpa aksen.
+    """
+    def __init__(self, series):
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            # Cukup lipat kategori unik, lalu petakan lewat codes
+            categories = series.cat.categories
+            codes = series.cat.codes.to_numpy()
+            case_keys = np.array([fold_case(c) for c in categories], dtype=object)
+            accent_keys = np.array([fold_accents(c) for c in categories], dtype=object)
+            valid = codes >= 0
+            positions = np.flatnonzero(valid)
+            case_keys = case_keys[codes[valid]]
+            accent_keys = accent_keys[codes[valid]]
+        else:
+            values = series.dropna()
+            positions = np.flatnonzero(series.notna().to_numpy())
+            case_keys = np.array([fold_case(v) for v in values], dtype=object)
+            accent_keys = np.array([fold_accents(v) for v in values], dtype=object)
+        self._by_case = self._group(case_keys, positions)
+        self._by_accent = self._group(accent_keys, positions)
+
+    @staticmethod
+    def _group(keys, positions):
+        if len(keys) == 0:
+            return {}
+        # Urutkan stabil supaya posisi dalam tiap grup tetap urut seperti di data
+        order = np.argsort(keys, kind="stable")
+        keys = keys[order]
+        positions = positions[order].astype(np.int32)
+        starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+        ends = np.r_[starts[1:], len(keys)]
+        return {keys[s]: positions[s:e] for s, e in zip(starts, ends)}
+
+    def lookup(self, key):
+        """Posisi baris (array int32, urut) untuk key, atau array kosong."""
+        positions = self._by_case.get(fold_case(key))
+        if positions is None:
+            positions = self._by_accent.get(fold_accents(key))
+        if positions is None:
+            return np.empty(0, dtype=np.int32)
+        return positions
+
+    def keys(self):
+        return self._by_case.keys()
+
+
+class LookupIndex:
+    """Indeks Name/Club/Position yang dibangun sekali saat data dimuat."""
+    COLUMNS = ("Name", "Club", "Position")
+
+    def __init__(self, data_frame):
+        self.columns = {
+            col: ColumnIndex(data_frame[col])
+            for col in self.COLUMNS if col in data_frame.columns
+        }
+        self.depends_on = tuple(self.columns)
+
+    def lookup(self, column, key):
+        return self.columns[column].lookup(key)
+
+
+def get_lookup_index(data_frame):
+    return get_derived(data_frame, "lookup", LookupIndex)
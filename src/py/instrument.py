@@ -0,0 +1,243 @@
+"""
+Instrumentasi opsional untuk aksi FIFAApp dan fungsi features.
+
+Setiap aksi (misalnya klik "Top Team") menjadi satu trace berisi tahap-tahap
+(parse CSV, filter, sort, isi Treeview, gambar chart) beserta durasi dan jumlah
+baris. Trace disimpan dalam ring buffer dan bisa di-dump ke file JSON Lines.
+Nonaktif secara default; aktifkan dengan enable() atau variabel lingkungan
+FIFA_TRACE=1. Saat nonaktif, overhead tiap fungsi hanya satu pengecekan flag.
+"""
+import collections
+import cProfile
+import functools
+import io
+import json
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+
+DEFAULT_CAPACITY = 200
+PROFILE_TOP = 25
+
+_enabled = os.environ.get("FIFA_TRACE", "") not in ("", "0")
+_traces = collections.deque(maxlen=DEFAULT_CAPACITY)
+_listeners = []
+_local = threading.local()
+_lock = threading.Lock()
+_capture = {"profile": False, "memory": False}
+
+
+def enable(capacity=None):
+    global _enabled, _traces
+    _enabled = True
+    if capacity is not None and capacity != _traces.maxlen:
+        with _lock:
+            _traces = collections.deque(_traces, maxlen=capacity)
+
+
+def disable():
+    global _enabled
+    _enabled = False
+
+
+def is_enabled():
+    return _enabled
+
+
+def capture_next(profile=False, memory=False):
+    """Jalankan aksi berikutnya di bawah cProfile dan/atau tracemalloc."""
+    _capture["profile"] = profile
+    _capture["memory"] = memory
+
+
+def add_listener(callback):
+    """callback(trace) dipanggil setiap aksi selesai (bisa dari thread lain)."""
+    _listeners.append(callback)
+
+
+def remove_listener(callback):
+    if callback in _listeners:
+        _listeners.remove(callback)
+
+
+def traces():
+    with _lock:
+        return list(_traces)
+
+
+def last_trace():
+    with _lock:
+        return _traces[-1] if _traces else None
+
+
+def clear():
+    with _lock:
+        _traces.clear()
+
+
+def dump(path):
+    """Tulis semua trace di buffer ke path (JSON Lines, ditambahkan di akhir file)."""
+    with open(path, "a", encoding="utf-8") as f:
+        for trace in traces():
+            f.write(json.dumps(trace, ensure_ascii=False, default=str) + "\n")
+    return path
+
+
+def count_rows(result):
+    if result is None:
+        return None
+    if isinstance(result, dict):
+        return 1
+    try:
+        return len(result)
+    except TypeError:
+        return None
+
+
+def _current():
+    return getattr(_local, "trace", None)
+
+
+class _Stage:
+    def __init__(self, name, rows=None):
+        self.name = name
+        self.rows = rows
+        self.record = None
+
+    def __enter__(self):
+        trace = _current()
+        if trace is None:
+            return self
+        self.record = {"stage": self.name, "depth": trace["_depth"], "rows": self.rows}
+        trace["stages"].append(self.record)
+        trace["_depth"] += 1
+        self._start = time.perf_counter()
+        return self
+
+    def set_rows(self, rows):
+        self.rows = rows
+        if self.record is not None:
+            self.record["rows"] = rows
+
+    def __exit__(self, *exc):
+        if self.record is not None:
+            self.record["ms"] = (time.perf_counter() - self._start) * 1000
+            _current()["_depth"] -= 1
+        return False
+
+
+class _NullStage:
+    def __enter__(self):
+        return self
+
+    def set_rows(self, rows):
+        pass
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_STAGE = _NullStage()
+
+
+def stage(name, rows=None):
+    """Context manager untuk satu tahap di dalam aksi yang sedang berjalan."""
+    if not _enabled or _current() is None:
+        return _NULL_STAGE
+    return _Stage(name, rows)
+
+
+class _Action:
+    def __init__(self, name):
+        self.name = name
+        self.nested = None
+
+    def __enter__(self):
+        if _current() is not None:
+            # Aksi di dalam aksi lain dicatat sebagai tahap saja
+            self.nested = _Stage(self.name)
+            return self.nested.__enter__()
+        self.trace = {"action": self.name, "thread": threading.current_thread().name,
+                      "started": time.time(), "stages": [], "_depth": 0}
+        _local.trace = self.trace
+        self.profiler = None
+        self.memory = False
+        if _capture["profile"]:
+            self.profiler = cProfile.Profile()
+            self.profiler.enable()
+        if _capture["memory"] and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self.memory = True
+        _capture["profile"] = _capture["memory"] = False
+        self._start = time.perf_counter()
+        return self
+
+    def set_rows(self, rows):
+        self.trace["rows"] = rows
+
+    def __exit__(self, exc_type, exc, tb):
+        if self.nested is not None:
+            return self.nested.__exit__(exc_type, exc, tb)
+        trace = self.trace
+        trace["ms"] = (time.perf_counter() - self._start) * 1000
+        if exc_type is not None:
+            trace["error"] = repr(exc)
+        if self.profiler is not None:
+            self.profiler.disable()
+            out = io.StringIO()
+            pstats.Stats(self.profiler, stream=out).sort_stats("cumulative").print_stats(PROFILE_TOP)
+            trace["profile"] = out.getvalue()
+        if self.memory:
+            current, peak = tracemalloc.get_traced_memory()
+            snapshot = tracemalloc.take_snapshot()
+            tracemalloc.stop()
+            trace["memory"] = {
+                "current_kb": current / 1024,
+                "peak_kb": peak / 1024,
+                "top": [str(stat) for stat in snapshot.statistics("lineno")[:10]],
+            }
+        del trace["_depth"]
+        _local.trace = None
+        with _lock:
+            _traces.append(trace)
+        for listener in list(_listeners):
+            listener(trace)
+        return False
+
+
+def action(name):
+    """Context manager untuk satu aksi pengguna; no-op jika instrumentasi nonaktif."""
+    if not _enabled:
+        return _NULL_STAGE
+    return _Action(name)
+
+
+def traced(func=None, name=None):
+    """
+    Decorator: catat pemanggilan fungsi sebagai tahap (atau aksi jika tidak ada
+    aksi yang sedang berjalan) beserta jumlah baris hasilnya.
+    """
+    if func is None:
+        return lambda f: traced(f, name)
+    label = name or func.__name__
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if not _enabled:
+            return func(*args, **kwargs)
+        with (stage(label) if _current() is not None else _Action(label)) as record:
+            result = func(*args, **kwargs)
+            record.set_rows(count_rows(result))
+            return result
+    return wrapper
+
+
+def format_trace(trace):
+    """Ringkasan satu baris untuk status bar: total dan tahap tingkat atas."""
+    parts = [f"{s['stage']} {s.get('ms', 0):.1f} ms"
+             + (f" ({s['rows']} baris)" if s.get("rows") is not None else "")
+             for s in trace["stages"] if s["depth"] == 0]
+    text = f"{trace['action']}: {trace['ms']:.1f} ms"
+    return text + (" — " + ", ".join(parts) if parts else "")
@@ -1,18 +1,418 @@
 import pandas as pd
+import numpy as np
 import os
+import json
+import hashlib
+import glob
+import re
+import concurrent.futures
+import multiprocessing
+from pandas.api.types import union_categoricals
+import instrument
 
-def load_csv_data(file_path=None):
+# Versi format cache; naikkan jika skema atau tata letak file cache berubah
+CACHE_VERSION = 1
+CACHE_DIR_NAME = ".fifa_cache"
+DEFAULT_FILE_PATH = os.path.join("data", "data.csv")
+
+# Kolom rating/atribut bilangan bulat kecil (0-99) -> int8
+RATING_COLUMNS = [
+    'Overall', 'Pace', 'Shooting', 'Passing', 'Dribbling', 'Defending', 'Physicality',
+    'Acceleration', 'Sprint', 'Positioning', 'Finishing', 'Shot', 'Long', 'Volleys',
+    'Penalties', 'Vision', 'Crossing', 'Free', 'Curve', 'Agility', 'Balance', 'Reactions',
+    'Ball', 'Composure', 'Interceptions', 'Heading', 'Def', 'Standing', 'Sliding',
+    'Jumping', 'Stamina', 'Strength', 'Aggression', 'Weak foot', 'Skill moves',
+]
+INT_COLUMNS = {'Age': 'int8', **{col: 'int8' for col in RATING_COLUMNS}}
+FLOAT_COLUMNS = {'GK': 'float32'}
+# Jumlah baris per chunk saat membaca CSV dengan laporan progres
+DEFAULT_CHUNKSIZE = 20000
+CATEGORY_COLUMNS = [
+    'Nation', 'Club', 'Position', 'Att work rate', 'Def work rate', 'Preferred foot', 'Gender',
+]
+# Kolom tambahan saat beberapa file digabung dengan load_many
+SOURCE_COLUMN = 'Source'
+SEASON_COLUMN = 'Season'
+# Musim dari nama file, misalnya "male_players_fc24.csv", "players_2023.csv" atau "fifa23"
+# Di bawah ukuran total ini file dibaca berurutan kecuali processes diberikan
+PARALLEL_MIN_BYTES = 32 * 1024 * 1024
+_SEASON_PATTERN = re.compile(r'(?:fc|fifa)[ _-]?(\d{2})(?!\d)|(?<!\d)((?:19|20)\d{2})(?!\d)', re.IGNORECASE)
+
+
+class LoadCancelled(Exception):
+    pass
+
+
+def _is_index_column(col):
+    return col.startswith('Unnamed') or col == ''
+
+
+def _parse_dtypes():
+    # Kolom bilangan bulat tidak diberi dtype saat parse karena bisa berisi NaN;
+    # konversinya dilakukan di _apply_schema
+    dtypes = {col: 'category' for col in CATEGORY_COLUMNS}
+    dtypes.update(FLOAT_COLUMNS)
+    return dtypes
+
+
+def _apply_schema(data_frame):
+    for col, dtype in INT_COLUMNS.items():
+        if col not in data_frame.columns:
+            continue
+        series = data_frame[col]
+        if not pd.api.types.is_numeric_dtype(series):
+            continue
+        if series.isna().any():
+            data_frame[col] = series.astype('float32')
+            continue
+        info = np.iinfo(dtype)
+        if series.min() >= info.min and series.max() <= info.max:
+            data_frame[col] = series.astype(dtype)
+        else:
+            data_frame[col] = pd.to_numeric(series, downcast='integer')
+    return data_frame
+
+
+def _concat_chunks(chunks):
+    if len(chunks) == 1:
+        return chunks[0]
+    columns = chunks[0].columns
+    cat_cols = [col for col in columns if isinstance(chunks[0][col].dtype, pd.CategoricalDtype)]
+    data_frame = pd.concat([chunk.drop(columns=cat_cols) for chunk in chunks], ignore_index=True)
+    # Kategori tiap chunk berbeda; gabungkan tanpa turun ke object dtype
+    for col in cat_cols:
+        data_frame[col] = union_categoricals([chunk[col] for chunk in chunks], sort_categories=True)
+    return data_frame[columns]
+
+
+def _read_kwargs(**kwargs):
+    return dict(
+        usecols=lambda col: not _is_index_column(col),
+        dtype=_parse_dtypes(),
+        **kwargs
+    )
+
+
+def iter_csv_chunks(file_path, chunksize=None, progress=None, cancel_event=None,
+                    apply_schema=True, **kwargs):
+    """
+    Membaca CSV FIFA per chunk (generator). progress(fraksi) dipanggil setelah
+    tiap chunk dan LoadCancelled dilempar jika cancel_event di-set.
+    """
+    total = max(os.path.getsize(file_path), 1)
+    with open(file_path, "rb") as f:
+        with pd.read_csv(f, chunksize=chunksize or DEFAULT_CHUNKSIZE, **_read_kwargs(**kwargs)) as reader:
+            for chunk in reader:
+                if cancel_event is not None and cancel_event.is_set():
+                    raise LoadCancelled("Pemuatan data dibatalkan.")
+                if progress is not None:
+                    progress(min(f.tell() / total, 1.0))
+                yield _apply_schema(chunk) if apply_schema else chunk
+
+
+def read_csv_fifa(file_path, progress=None, cancel_event=None, chunksize=None, **kwargs):
+    """
+    Membaca CSV FIFA dengan skema eksplisit dan tanpa kolom indeks.
+    Jika progress/cancel_event diberikan, file dibaca per chunk; lihat iter_csv_chunks.
+    """
+    if progress is None and cancel_event is None and chunksize is None:
+        return _apply_schema(pd.read_csv(file_path, **_read_kwargs(**kwargs)))
+
+    # Skema diterapkan setelah digabung supaya dtype konsisten di semua chunk
+    chunks = list(iter_csv_chunks(file_path, chunksize, progress, cancel_event,
+                                  apply_schema=False, **kwargs))
+    if not chunks:
+        return _apply_schema(pd.read_csv(file_path, nrows=0, **_read_kwargs(**kwargs)))
+    return _apply_schema(_concat_chunks(chunks))
+
+
+def _cache_dir(file_path, cache_root=None):
+    file_path = os.path.abspath(file_path)
+    if cache_root is None:
+        cache_root = os.path.join(os.path.dirname(file_path), CACHE_DIR_NAME)
+    key = hashlib.sha1(file_path.encode("utf-8")).hexdigest()[:16]
+    stem = os.path.splitext(os.path.basename(file_path))[0]
+    return os.path.join(cache_root, f"{stem}-{key}")
+
+
+def _source_stamp(file_path):
+    stat = os.stat(file_path)
+    return {
+        "version": CACHE_VERSION,
+        "source": os.path.abspath(file_path),
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+    }
+
+
+def _read_cache(cache_dir, stamp):
+    manifest_path = os.path.join(cache_dir, "manifest.json")
+    if not os.path.exists(manifest_path):
+        return None
+    try:
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        if any(manifest.get(k) != v for k, v in stamp.items()):
+            return None
+        columns = {}
+        for i, meta in enumerate(manifest["columns"]):
+            path = os.path.join(cache_dir, f"{i}.npy")
+            if meta["kind"] == "category":
+                codes = np.load(path, mmap_mode="r")
+                categories = pd.Index(meta["categories"], dtype=meta.get("categories_dtype"))
+                columns[meta["name"]] = pd.Categorical.from_codes(np.asarray(codes), categories)
+            elif meta["kind"] == "string":
+                values = np.load(path).astype(object)
+                values[np.load(os.path.join(cache_dir, f"{i}.mask.npy"))] = np.nan
+                columns[meta["name"]] = values
+            else:
+                columns[meta["name"]] = np.load(path, mmap_mode="r")
+        return pd.DataFrame(columns, copy=True)
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def _write_cache(cache_dir, stamp, data_frame):
+    os.makedirs(cache_dir, exist_ok=True)
+    columns = []
+    for i, col in enumerate(data_frame.columns):
+        series = data_frame[col]
+        path = os.path.join(cache_dir, f"{i}.npy")
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            categories = series.cat.categories
+            np.save(path, series.cat.codes.to_numpy())
+            columns.append({"name": col, "kind": "category",
+                            "categories": categories.tolist(),
+                            "categories_dtype": str(categories.dtype)})
+        elif pd.api.types.is_numeric_dtype(series):
+            np.save(path, series.to_numpy())
+            columns.append({"name": col, "kind": "numeric"})
+        else:
+            mask = series.isna().to_numpy()
+            np.save(path, series.fillna("").to_numpy(dtype=str))
+            np.save(os.path.join(cache_dir, f"{i}.mask.npy"), mask)
+            columns.append({"name": col, "kind": "string"})
+    # Manifest ditulis terakhir supaya cache yang setengah jadi tidak pernah valid
+    manifest = dict(stamp, rows=len(data_frame), columns=columns)
+    tmp_path = os.path.join(cache_dir, "manifest.json.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f)
+    os.replace(tmp_path, os.path.join(cache_dir, "manifest.json"))
+
+
+@instrument.traced
+def load_csv_data(file_path=None, use_cache=True, cache_root=None,
+                  progress=None, cancel_event=None, chunksize=None):
     if file_path is None:
-        file_path = os.path.join("data", "data.csv")
-        
+        file_path = DEFAULT_FILE_PATH
+
     if not os.path.exists(file_path):
         raise FileNotFoundError(f"CSV file tidak ditemukan: {file_path}")
-    
+
+    stamp = _source_stamp(file_path)
+    cache_dir = _cache_dir(file_path, cache_root)
+    if use_cache:
+        with instrument.stage("read_cache") as record:
+            data_frame = _read_cache(cache_dir, stamp)
+            record.set_rows(instrument.count_rows(data_frame))
+        if data_frame is not None:
+            if progress is not None:
+                progress(1.0)
+            return data_frame
+
     try:
-        data_frame = pd.read_csv(file_path)
-        # Hilangkan semua kolom "Unnamed: ..." (misalnya "Unnamed: 0")
-        data_frame = data_frame.loc[:, ~data_frame.columns.str.startswith('Unnamed')]
+        # Kolom "Unnamed: ..." (misalnya "Unnamed: 0") dilewati saat parse
+        with instrument.stage("parse_csv") as record:
+            data_frame = read_csv_fifa(file_path, progress=progress,
+                                       cancel_event=cancel_event, chunksize=chunksize)
+            record.set_rows(len(data_frame))
+    except LoadCancelled:
+        raise
     except Exception as e:
         raise Exception(f"Gagal membaca CSV file: {e}")
-    
-    return data_frame
\ No newline at end of file
+
+    if use_cache:
+        try:
+            with instrument.stage("write_cache"):
+                _write_cache(cache_dir, stamp, data_frame)
+        except OSError:
+            # Cache hanya optimasi; lokasi read-only tidak boleh menggagalkan load
+            pass
+
+    return data_frame
+
+
+def expand_sources(sources):
+    """
+    Daftar file CSV dari folder, pola glob (misalnya "data/*.csv"), path file,
+    atau list berisi kombinasi ketiganya. Urutan hasil stabil (alfabetis).
+    """
+    if isinstance(sources, (str, os.PathLike)):
+        sources = [sources]
+    paths = []
+    for source in sources:
+        source = os.fspath(source)
+        if os.path.isdir(source):
+            matches = sorted(glob.glob(os.path.join(source, "*.csv")))
+        elif glob.has_magic(source):
+            matches = sorted(glob.glob(source))
+        else:
+            matches = [source]
+        paths.extend(path for path in matches if path not in paths)
+    if not paths:
+        raise FileNotFoundError(f"Tidak ada file CSV yang cocok: {', '.join(map(str, sources))}")
+    return paths
+
+
+def season_of(file_path):
+    """Musim dari nama file ('24', '2023', ...) atau None jika tidak ada."""
+    match = _SEASON_PATTERN.search(os.path.splitext(os.path.basename(file_path))[0])
+    if match is None:
+        return None
+    return match.group(1) or match.group(2)
+
+
+def _load_worker(file_path, use_cache, cache_root, chunksize):
+    data_frame = load_csv_data(file_path, use_cache=use_cache, cache_root=cache_root,
+                               chunksize=chunksize)
+    # Di proses pool dengan cache, hasil tidak dikirim balik lewat pipe (pickle);
+    # proses utama membacanya dari cache biner yang baru ditulis
+    if use_cache and multiprocessing.parent_process() is not None and os.path.exists(os.path.join(_cache_dir(file_path, cache_root), "manifest.json")):
+        return None
+    return data_frame
+
+
+def _missing_column(like, length):
+    # Kolom yang tidak ada di salah satu file diisi kosong dengan dtype yang cocok
+    if isinstance(like.dtype, pd.CategoricalDtype):
+        return pd.Categorical.from_codes(np.full(length, -1), like.cat.categories)
+    if pd.api.types.is_numeric_dtype(like):
+        return np.full(length, np.nan, dtype=np.float32)
+    return pd.Series([np.nan] * length, dtype=object)
+
+
+def _constant_column(value, length):
+    # Kategori selalu bertipe str, juga untuk file tanpa musim (None), supaya
+    # union_categoricals bisa menggabungkan semua file
+    categories = pd.Index([] if value is None else [str(value)], dtype=str)
+    codes = np.full(length, -1 if value is None else 0, dtype=np.int8)
+    return pd.Categorical.from_codes(codes, categories)
+
+
+def reconcile_frames(frames, labels=None, seasons=None):
+    """
+    Gabungkan DataFrame dengan kolom yang bisa berbeda/tertukar urutannya.
+    Kolom yang hilang di sebagian file diisi kosong.
+    labels dan seasons (opsional) menjadi kolom Source dan Season.
+    """
+    # Urutan kolom mengikuti file dengan kolom terbanyak, kolom lain ditambahkan di akhir
+    columns = list(max(frames, key=lambda frame: len(frame.columns)).columns)
+    for frame in frames:
+        columns.extend(col for col in frame.columns if col not in columns)
+    examples = {}
+    for frame in frames:
+        for col in frame.columns:
+            examples.setdefault(col, frame[col])
+    aligned = []
+    for i, frame in enumerate(frames):
+        missing = {col: _missing_column(examples[col], len(frame))
+                   for col in columns if col not in frame.columns}
+        if missing:
+            frame = frame.assign(**missing)
+        frame = frame[columns]
+        extra = {}
+        if labels is not None:
+            extra[SOURCE_COLUMN] = _constant_column(labels[i], len(frame))
+        if seasons is not None:
+            extra[SEASON_COLUMN] = _constant_column(seasons[i], len(frame))
+        aligned.append(frame.assign(**extra) if extra else frame)
+    # Kolom numerik yang hilang di satu file membuat dtype-nya float; _apply_schema
+    # mengembalikannya ke int8 bila tidak ada nilai kosong
+    return _apply_schema(_concat_chunks(aligned))
+
+
+def map_files(func, paths, args=(), processes=None, progress=None, cancel_event=None):
+    """
+    Jalankan func(path, *args) untuk setiap file, paralel di process pool bila
+    ada lebih dari satu core dan ukuran file totalnya cukup besar. func harus
+    fungsi tingkat modul (bisa di-pickle). Hasil berurutan sesuai paths;
+    progress(jumlah selesai) dipanggil setiap satu file selesai.
+    """
+    total_bytes = sum(os.path.getsize(path) for path in paths)
+    workers = min(processes or os.cpu_count() or 1, len(paths))
+    if processes is None and total_bytes < PARALLEL_MIN_BYTES:
+        # Biaya menyalakan proses (import pandas) lebih besar daripada parse file kecil
+        workers = 1
+    results = [None] * len(paths)
+    if workers <= 1:
+        for i, path in enumerate(paths):
+            if cancel_event is not None and cancel_event.is_set():
+                raise LoadCancelled("Pemuatan data dibatalkan.")
+            results[i] = func(path, *args)
+            if progress is not None:
+                progress(i + 1)
+        return results
+
+    # spawn: aman dipanggil dari thread GUI dan sama perilakunya di semua OS
+    context = multiprocessing.get_context("spawn")
+    executor = concurrent.futures.ProcessPoolExecutor(max_workers=workers, mp_context=context)
+    try:
+        futures = {executor.submit(func, path, *args): i for i, path in enumerate(paths)}
+        for done, future in enumerate(concurrent.futures.as_completed(futures), 1):
+            if cancel_event is not None and cancel_event.is_set():
+                raise LoadCancelled("Pemuatan data dibatalkan.")
+            i = futures[future]
+            try:
+                results[i] = future.result()
+            except LoadCancelled:
+                raise
+            except Exception as e:
+                raise Exception(f"{os.path.basename(paths[i])}: {e}")
+            if progress is not None:
+                progress(done)
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+    return results
+
+
+@instrument.traced
+def load_many(sources, processes=None, use_cache=True, cache_root=None,
+              progress=None, cancel_event=None, chunksize=None):
+    """
+    Muat banyak file CSV (folder, glob atau daftar path) secara paralel di
+    process pool, lalu gabungkan menjadi satu DataFrame dengan kolom Source
+    (nama file) dan Season (dari nama file, jika ada).
+    """
+    paths = expand_sources(sources)
+    for path in paths:
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"CSV file tidak ditemukan: {path}")
+
+    frames = {}
+    pending = []
+    with instrument.stage("read_cache"):
+        for path in paths:
+            cached = _read_cache(_cache_dir(path, cache_root), _source_stamp(path)) if use_cache else None
+            if cached is not None:
+                frames[path] = cached
+            else:
+                pending.append(path)
+
+    with instrument.stage("parse_csv", rows=len(pending)):
+        done = len(frames)
+        results = map_files(_load_worker, pending, (use_cache, cache_root, chunksize), processes,
+                            progress=None if progress is None else
+                            (lambda n: progress((done + n) / len(paths))),
+                            cancel_event=cancel_event)
+        for path, data_frame in zip(pending, results):
+            frames[path] = data_frame if data_frame is not None \
+                else load_csv_data(path, cache_root=cache_root)
+
+    with instrument.stage("combine") as record:
+        labels = [os.path.splitext(os.path.basename(path))[0] for path in paths]
+        data_frame = reconcile_frames([frames[path] for path in paths], labels,
+                                      [season_of(path) for path in paths])
+        record.set_rows(len(data_frame))
+    if progress is not None:
+        progress(1.0)
+    return data_frame
@@ -1,40 +1,60 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
-import pandas as pd  
 import webbrowser
+import os
+import queue
+import threading
 import load
 import features
+import search
+import widgets
+import registry
+import export
+import instrument
+import cache
+import query
+import squad
+import reload
+
+WATCH_INTERVAL_MS = 2000
 
 class AutocompleteCombobox(ttk.Combobox):
     """
     Combobox dengan fitur autocomplete.
     Dropdown akan muncul saat fokus masuk tanpa input,
-    dan menyajikan saran sesuai input.
+    dan menyajikan saran sesuai input (prefix, prefix kata, atau substring).
+    Hasil dibatasi max_results dan pencarian di-debounce selama debounce_ms.
     """
-    def __init__(self, master=None, **kwargs):
+    def __init__(self, master=None, max_results=50, debounce_ms=120, **kwargs):
         super().__init__(master, **kwargs)
-        self._completion_list = []
+        self.max_results = max_results
+        self.debounce_ms = debounce_ms
+        self._index = search.PrefixIndex([])
+        self._pending = None
         self.bind('<KeyRelease>', self.handle_keyrelease)
         self.bind("<FocusIn>", self.on_focusin)
 
     def set_completion_list(self, completion_list):
-        self._completion_list = sorted(completion_list, key=str.lower)
-        self['values'] = self._completion_list
+        self._index = completion_list if isinstance(completion_list, search.PrefixIndex) \
+            else search.PrefixIndex(completion_list)
+        self['values'] = self._index.items[:self.max_results]
 
     def on_focusin(self, event):
         if not self.get():
-            self['values'] = self._completion_list
+            self['values'] = self._index.items[:self.max_results]
             self.event_generate('<Down>')
 
     def handle_keyrelease(self, event):
         if event.keysym in ("BackSpace", "Left", "Right", "Up", "Down", "Return", "Escape"):
             return
-        text = self.get()
-        if text == '':
-            self['values'] = self._completion_list
-        else:
-            filtered = [item for item in self._completion_list if item.lower().startswith(text.lower())]
-            self['values'] = filtered if filtered else self._completion_list
+        if self._pending is not None:
+            self.after_cancel(self._pending)
+        self._pending = self.after(self.debounce_ms, self._update_values)
+
+    def _update_values(self):
+        self._pending = None
+        matches = self._index.search(self.get(), limit=self.max_results)
+        self['values'] = matches if matches else self._index.items[:self.max_results]
 
 class FIFAApp(tk.Tk):
     def __init__(self):
@@ -42,6 +62,21 @@ class FIFAApp(tk.Tk):
         self.title("FIFA Data Viewer")
         self.configure(bg="#f0f0f0")
         self.data_frame = None
+        self.registry = registry.DatasetRegistry()
+        self._dataset_keys = {}
+        self._load_queue = queue.Queue()
+        self._load_cancel = None
+        self._task_cancel = None
+        self._poll_id = None
+        self._trace_queue = queue.Queue()
+        self._trace_poll_id = None
+        self._active_key = None
+        self._watchers = {}
+        self._reloading = set()
+        self._reload_queue = queue.Queue()
+        self._reload_poll_id = None
+        self._watch_id = None
+        self._refreshers = []
 
         # Setup style
         self.style = ttk.Style(self)
@@ -52,6 +87,7 @@ class FIFAApp(tk.Tk):
         self.style.configure("TButton", font=("Arial", 10))
         
         self.create_widgets()
+        self.create_menu()
         self.ask_for_csv()  
         
         self.update_idletasks()
@@ -69,23 +105,138 @@ class FIFAApp(tk.Tk):
         
         load_button = ttk.Button(header_frame, text="Pilih CSV", command=self.ask_for_csv)
         load_button.pack(side=tk.RIGHT)
+        folder_button = ttk.Button(header_frame, text="Pilih Folder", command=self.ask_for_folder)
+        folder_button.pack(side=tk.RIGHT, padx=(0,5))
+        self.cancel_button = ttk.Button(header_frame, text="Batal", command=self.cancel_background,
+                                        state="disabled")
+        self.cancel_button.pack(side=tk.RIGHT, padx=(0,5))
+        
+        self.dataset_combo = ttk.Combobox(header_frame, state="readonly", width=30)
+        self.dataset_combo.pack(side=tk.RIGHT, padx=(0,5))
+        self.dataset_combo.bind("<<ComboboxSelected>>", self.on_dataset_selected)
+        ttk.Label(header_frame, text="Dataset:").pack(side=tk.RIGHT, padx=(0,5))
         
         button_frame = ttk.Frame(self)
         button_frame.pack(side=tk.BOTTOM, fill=tk.X, padx=10, pady=10)
         
-        ttk.Button(button_frame, text="Info Player", command=self.show_info_player)\
-            .grid(row=0, column=0, padx=5, pady=5)
-        ttk.Button(button_frame, text="Info Team", command=self.show_info_team)\
-            .grid(row=0, column=1, padx=5, pady=5)
-        ttk.Button(button_frame, text="Summary", command=self.show_summary)\
-            .grid(row=0, column=2, padx=5, pady=5)
-        ttk.Button(button_frame, text="Top Player", command=self.show_top_player)\
-            .grid(row=0, column=3, padx=5, pady=5)
-        ttk.Button(button_frame, text="Top Team", command=self.show_top_team)\
-            .grid(row=0, column=4, padx=5, pady=5)
-        ttk.Button(button_frame, text="Visual Data", command=self.show_visual_data)\
-            .grid(row=0, column=5, padx=5, pady=5)
+        actions = [
+            ("Info Player", self.show_info_player),
+            ("Info Team", self.show_info_team),
+            ("Summary", self.show_summary),
+            ("Top Player", self.show_top_player),
+            ("Top Team", self.show_top_team),
+            ("Best XI", self.show_best_xi),
+            ("Query", self.show_query),
+            ("Visual Data", self.show_visual_data),
+        ]
+        self.action_buttons = []
+        for column, (text, command) in enumerate(actions):
+            button = ttk.Button(button_frame, text=text, command=command)
+            button.grid(row=0, column=column, padx=5, pady=5)
+            self.action_buttons.append(button)
         
+    def create_menu(self):
+        menubar = tk.Menu(self)
+        trace_menu = tk.Menu(menubar, tearoff=0)
+        self.trace_var = tk.BooleanVar(value=instrument.is_enabled())
+        trace_menu.add_checkbutton(label="Aktifkan timing", variable=self.trace_var,
+                                   command=self.toggle_tracing)
+        trace_menu.add_command(label="Profil aksi berikutnya (cProfile)",
+                               command=lambda: self.arm_capture(profile=True))
+        trace_menu.add_command(label="Ukur memori aksi berikutnya (tracemalloc)",
+                               command=lambda: self.arm_capture(memory=True))
+        trace_menu.add_separator()
+        trace_menu.add_command(label="Simpan trace...", command=self.save_traces)
+        trace_menu.add_command(label="Statistik cache query", command=self.show_cache_stats)
+        menubar.add_cascade(label="Instrumentasi", menu=trace_menu)
+        data_menu = tk.Menu(menubar, tearoff=0)
+        self.watch_var = tk.BooleanVar(value=False)
+        data_menu.add_checkbutton(label="Pantau perubahan file", variable=self.watch_var,
+                                  command=self.toggle_watch)
+        data_menu.add_command(label="Terapkan perubahan file sekarang", command=self.check_sources)
+        menubar.add_cascade(label="Data", menu=data_menu)
+        self.config(menu=menubar)
+        instrument.add_listener(self._trace_queue.put)
+        if instrument.is_enabled():
+            self._schedule_trace_poll()
+    
+    def toggle_tracing(self):
+        if self.trace_var.get():
+            instrument.enable()
+            self._schedule_trace_poll()
+            self.status_label.config(text="Timing aktif.")
+        else:
+            instrument.disable()
+            self.status_label.config(text="Timing nonaktif.")
+    
+    def arm_capture(self, profile=False, memory=False):
+        if not instrument.is_enabled():
+            self.trace_var.set(True)
+            self.toggle_tracing()
+        instrument.capture_next(profile=profile, memory=memory)
+        self.status_label.config(text="Aksi berikutnya akan diprofil.")
+    
+    def save_traces(self):
+        path = filedialog.asksaveasfilename(
+            title="Simpan trace",
+            defaultextension=".jsonl",
+            filetypes=[("JSON Lines", "*.jsonl"), ("All Files", "*.*")]
+        )
+        if not path:
+            return
+        try:
+            instrument.dump(path)
+            messagebox.showinfo("Success", f"Trace berhasil disimpan di: {path}")
+        except OSError as e:
+            messagebox.showerror("Error", f"Gagal menyimpan trace: {e}")
+    
+    def show_cache_stats(self):
+        stats = cache.stats()
+        messagebox.showinfo(
+            "Cache Query",
+            f"Hit: {stats['hits']}\nMiss: {stats['misses']}\n"
+            f"Hit rate: {stats['hit_rate']:.0%}\nEntri: {stats['entries']}\n"
+            f"Ukuran: {stats['bytes'] / 1024:.1f} KiB\nEviksi: {stats['evictions']}"
+        )
+    
+    def _schedule_trace_poll(self):
+        # Hanya satu loop polling yang berjalan, walaupun timing diaktifkan berulang kali
+        if self._trace_poll_id is None:
+            self._trace_poll_id = self.after(250, self._poll_traces)
+    
+    def _poll_traces(self):
+        self._trace_poll_id = None
+        # Listener bisa dipanggil dari thread worker, jadi trace dibaca lewat antrean di thread UI
+        while True:
+            try:
+                trace = self._trace_queue.get_nowait()
+            except queue.Empty:
+                break
+            self.status_label.config(text=instrument.format_trace(trace))
+            if "profile" in trace or "memory" in trace:
+                self.show_trace_report(trace)
+        if instrument.is_enabled():
+            self._schedule_trace_poll()
+    
+    def show_trace_report(self, trace):
+        win = tk.Toplevel(self)
+        win.title(f"Profil: {trace['action']}")
+        text = tk.Text(win, wrap="none", font=("Courier", 9))
+        scroll_y = ttk.Scrollbar(win, orient="vertical", command=text.yview)
+        text.configure(yscrollcommand=scroll_y.set)
+        scroll_y.pack(side=tk.RIGHT, fill=tk.Y)
+        text.pack(fill=tk.BOTH, expand=True)
+        text.insert(tk.END, instrument.format_trace(trace) + "\n\n")
+        if "memory" in trace:
+            memory = trace["memory"]
+            text.insert(tk.END, f"tracemalloc: peak {memory['peak_kb']:.1f} KiB, "
+                                f"sisa {memory['current_kb']:.1f} KiB\n")
+            text.insert(tk.END, "\n".join(memory["top"]) + "\n\n")
+        if "profile" in trace:
+            text.insert(tk.END, trace["profile"])
+        text.config(state="disabled")
+        win.minsize(600, 400)
+    
     def ask_for_csv(self):
         file_path = filedialog.askopenfilename(
             title="Pilih file CSV",
@@ -97,16 +248,263 @@ class FIFAApp(tk.Tk):
             messagebox.showwarning("Peringatan", "Tidak ada file CSV yang dipilih!")
             self.status_label.config(text="Tidak ada file CSV yang dipilih!")
     
-    def load_data(self, file_path):
+    def ask_for_folder(self):
+        # Semua CSV di folder (misalnya satu file per musim/gender) dimuat paralel jadi satu dataset
+        folder = filedialog.askdirectory(title="Pilih folder berisi file CSV")
+        if not folder:
+            return
         try:
-            self.data_frame = load.load_csv_data(file_path)
-            self.status_label.config(text="Data berhasil dimuat!")
-        except Exception as e:
-            messagebox.showerror("Error", str(e))
-            self.status_label.config(text=str(e))
+            load.expand_sources(folder)
+        except FileNotFoundError:
+            messagebox.showwarning("Peringatan", "Folder tidak berisi file CSV!")
+            return
+        self.load_data(folder)
+    
+    def set_actions_state(self, state):
+        for button in self.action_buttons:
+            button.config(state=state)
+    
+    def load_data(self, file_path):
+        # Batalkan pemuatan sebelumnya (jika ada) lalu muat di thread terpisah
+        self.cancel_load()
+        cancel_event = threading.Event()
+        self._load_cancel = cancel_event
+        self.set_actions_state("disabled")
+        self.cancel_button.config(state="normal")
+        self.status_label.config(text="Memuat data... 0%")
+        
+        @instrument.traced(name="Load CSV")
+        # Snapshot baris untuk reload inkremental hanya dibuat jika pemantauan aktif
+        watching = self.watch_var.get()
+        
+        def load_and_prepare():
+            is_folder = os.path.isdir(file_path)
+            # Stempel diambil sebelum membaca supaya perubahan selama pemuatan tetap terdeteksi
+            stamp = None if is_folder else reload.file_stamp(file_path)
+            reader = load.load_many if is_folder else load.load_csv_data
+            data_frame = reader(
+                file_path,
+                progress=lambda frac: self._load_queue.put((cancel_event, "progress", frac)),
+                cancel_event=cancel_event
+            )
+            self._load_queue.put((cancel_event, "progress", 1.0))
+            # Versi dataset baru: hasil query yang tersimpan untuk data lama tidak dipakai lagi
+            cache.bump(data_frame)
+            # Indeks dibangun di thread yang sama agar UI tetap responsif
+            with instrument.stage("prepare_indexes"):
+                features.prepare(data_frame)
+            watcher = None
+            if stamp is not None:
+                watcher = reload.SourceWatcher(file_path, data_frame, stamp=stamp)
+                if watching:
+                    with instrument.stage("snapshot"):
+                        watcher.prepare()
+            return data_frame, watcher
+        
+        def worker():
+            try:
+                data_frame, watcher = load_and_prepare()
+                self._load_queue.put((cancel_event, "done", (file_path, data_frame, watcher)))
+            except load.LoadCancelled:
+                self._load_queue.put((cancel_event, "cancelled", None))
+            except Exception as e:
+                self._load_queue.put((cancel_event, "error", e))
+        
+        threading.Thread(target=worker, daemon=True).start()
+        if self._poll_id is None:
+            self._poll_id = self.after(100, self._poll_load)
+    
+    def cancel_load(self):
+        if self._load_cancel is not None:
+            self._load_cancel.set()
+    
+    def _poll_load(self):
+        finished = False
+        while True:
+            try:
+                token, kind, payload = self._load_queue.get_nowait()
+            except queue.Empty:
+                break
+            if token is not self._load_cancel:
+                # Pesan dari pemuatan lama yang sudah diganti
+                continue
+            if kind == "progress":
+                self.status_label.config(text=f"Memuat data... {payload:.0%}")
+                continue
+            finished = True
+            self._load_cancel = None
+            if self._task_cancel is None:
+                self.cancel_button.config(state="disabled")
+            if kind == "done":
+                # Data disimpan ke memori (tidak langsung ditampilkan)
+                file_path, data_frame, watcher = payload
+                key = self.registry.add_file(data_frame, file_path)
+                if watcher is not None and watcher.supported:
+                    self._watchers[key] = watcher
+                else:
+                    self._watchers.pop(key, None)
+                self.refresh_datasets()
+                self.select_dataset(key)
+                self.status_label.config(text="Data berhasil dimuat!")
+            elif kind == "cancelled":
+                self.status_label.config(text="Pemuatan data dibatalkan.")
+            else:
+                messagebox.showerror("Error", str(payload))
+                self.status_label.config(text=str(payload))
+            # Data lama tetap bisa dipakai jika pemuatan baru gagal/dibatalkan
+            self.set_actions_state("normal")
+        self._poll_id = None
+        if not finished and self._load_cancel is not None:
+            self._poll_id = self.after(100, self._poll_load)
+    
+    def toggle_watch(self):
+        if self._watch_id is not None:
+            self.after_cancel(self._watch_id)
+            self._watch_id = None
+        if self.watch_var.get():
+            # Snapshot hash baris dibuat sekarang (di thread lain), bukan saat data dimuat
+            watchers = [w for w in self._watchers.values() if w.snapshot is None]
+            if watchers:
+                threading.Thread(target=lambda: [w.prepare() for w in watchers], daemon=True).start()
+            self._watch_id = self.after(WATCH_INTERVAL_MS, self._watch_sources)
+            self.status_label.config(text="Pemantauan file aktif.")
+        else:
+            self.status_label.config(text="Pemantauan file nonaktif.")
+    
+    def _watch_sources(self):
+        self._watch_id = None
+        self.check_sources(quiet=True)
+        if self.watch_var.get():
+            self._watch_id = self.after(WATCH_INTERVAL_MS, self._watch_sources)
+    
+    def check_sources(self, quiet=False):
+        """
+        Cek file sumber yang berubah. Diff dan parse baris yang berubah
+        dijalankan di thread lain; delta diterapkan di thread UI.
+        """
+        changed = [(key, watcher) for key, watcher in self._watchers.items()
+                   if key not in self._reloading and watcher.changed()]
+        if not changed:
+            if not quiet:
+                self.status_label.config(text="Tidak ada perubahan file.")
             return
-        # Data disimpan ke memori (tidak langsung ditampilkan)
         
+        def worker(key, watcher):
+            try:
+                delta = watcher.poll()
+                if delta.frame is not None:
+                    # DataFrame baru belum dipakai UI, jadi indeksnya bisa dibangun di sini
+                    features.prepare(delta.frame)
+                self._reload_queue.put((key, watcher, "done", delta))
+            except Exception as e:
+                self._reload_queue.put((key, watcher, "error", e))
+        
+        for key, watcher in changed:
+            self._reloading.add(key)
+            threading.Thread(target=worker, args=(key, watcher), daemon=True).start()
+        if self._reload_poll_id is None:
+            self._reload_poll_id = self.after(100, self._poll_reload)
+    
+    def _poll_reload(self):
+        while True:
+            try:
+                key, watcher, kind, payload = self._reload_queue.get_nowait()
+            except queue.Empty:
+                break
+            self._reloading.discard(key)
+            if self._watchers.get(key) is not watcher:
+                # Dataset sudah dimuat ulang penuh sementara diff berjalan
+                continue
+            if kind == "done":
+                self.apply_delta(key, watcher, payload)
+            else:
+                # Perubahan yang tidak bisa diterapkan inkremental: muat ulang penuh
+                self._watchers.pop(key)
+                self.status_label.config(text=f"Muat ulang penuh: {payload}")
+                self.load_data(watcher.file_path)
+        self._reload_poll_id = None
+        if self._reloading:
+            self._reload_poll_id = self.after(100, self._poll_reload)
+    
+    @instrument.traced(name="Reload")
+    def apply_delta(self, key, watcher, delta):
+        data_frame = watcher.apply(delta)
+        if delta.empty:
+            return
+        # add() juga menyamakan kategori dengan dataset lain dan membuang gabungan lama
+        info = self.registry.info(key)
+        self.registry.add(data_frame, key, season=info["season"], gender=info["gender"])
+        active = self._active_key
+        if active is None or active == key or (isinstance(active, tuple) and key in active):
+            def notify():
+                for window, callback in list(self._refreshers):
+                    callback(self.data_frame)
+            self.select_dataset(active, on_selected=notify)
+        self.status_label.config(text=f"Reload {self.registry.label(key)}: {delta.describe()}")
+    
+    def on_reload(self, window, callback):
+        """callback(data_frame) dipanggil setelah dataset aktif diperbarui, sampai window ditutup."""
+        entry = (window, callback)
+        self._refreshers.append(entry)
+        
+        def on_destroy(event):
+            if event.widget is window and entry in self._refreshers:
+                self._refreshers.remove(entry)
+        window.bind("<Destroy>", on_destroy, add="+")
+        
+    def refresh_datasets(self):
+        # Pilihan: tiap dataset, gabungan per gender/musim (jika lebih dari satu), dan semua dataset.
+        # Nilai None = semua dataset, tuple = gabungan beberapa key
+        keys = self.registry.keys()
+        self._dataset_keys = {self.registry.label(key): key for key in keys}
+        if len(keys) > 1:
+            infos = [self.registry.info(key) for key in keys]
+            for field, name in (("gender", "{}"), ("season", "musim {}")):
+                for value in sorted({info[field] for info in infos if info[field]}):
+                    group = tuple(self.registry.keys_for(**{field: value}))
+                    if 1 < len(group) < len(keys):
+                        self._dataset_keys[f"{registry.ALL_DATASETS} / {name.format(value)}"] = group
+            self._dataset_keys[registry.ALL_DATASETS] = None
+        self.dataset_combo['values'] = list(self._dataset_keys)
+    
+    def _dataset_label(self, key):
+        for label, value in self._dataset_keys.items():
+            if value == key:
+                return label
+        return registry.ALL_DATASETS if key is None else self.registry.label(key)
+    
+    def select_dataset(self, key, on_selected=None):
+        """
+        Aktifkan dataset. Dataset tunggal sudah ada di memori beserta indeksnya;
+        gabungan (key None atau tuple) disalin dan diindeks di thread latar.
+        """
+        label = self._dataset_label(key)
+        
+        def activate(data_frame):
+            self.data_frame = data_frame
+            self._active_key = key
+            self.dataset_combo.set(label)
+            self.status_label.config(text=f"Dataset aktif: {label}")
+            if on_selected is not None:
+                on_selected()
+        
+        if key is not None and not isinstance(key, tuple):
+            activate(self.registry.get(key))
+            return
+        # Gabungan dibuat di thread UI (registry tidak thread-safe); yang mahal, yaitu
+        # membangun indeks, dijalankan di thread latar
+        view = self.registry.union(key)
+        
+        def prepare(progress, cancel_event):
+            features.prepare(view)
+            return view
+        self.run_background(f"Menyiapkan {label}", prepare, on_done=activate)
+    
+    def on_dataset_selected(self, event=None):
+        label = self.dataset_combo.get()
+        if label in self._dataset_keys:
+            self.select_dataset(self._dataset_keys[label])
+    
     def show_info_player(self):
         if self.data_frame is None:
             messagebox.showwarning("Warning", "Data belum dimuat!")
@@ -116,9 +514,9 @@ class FIFAApp(tk.Tk):
         win.title("Info Player")
         
         ttk.Label(win, text="Masukkan atau pilih nama pemain:").pack(pady=5)
-        try:
-            player_list = sorted(self.data_frame['Name'].dropna().unique().tolist())
-        except KeyError:
+        # Daftar nama dan indeks autocomplete diambil dari cache, tidak diurutkan ulang tiap kali
+        player_list = features.completion_index(self.data_frame, 'Name')
+        if player_list is None:
             messagebox.showerror("Error", "Kolom 'Name' tidak ditemukan.")
             win.destroy()
             return
@@ -127,6 +525,7 @@ class FIFAApp(tk.Tk):
         combo.set_completion_list(player_list)
         combo.pack(pady=5, padx=10, fill=tk.X)
         
+        @instrument.traced(name="Info Player")
         def on_select():
             player_name = combo.get().strip()
             info = features.info_player(self.data_frame, player_name)
@@ -149,8 +548,20 @@ class FIFAApp(tk.Tk):
                 tree.heading("attribute", text="Attribute")
                 tree.heading("value", text="Value")
                 
-                for k, v in info.items():
-                    tree.insert("", tk.END, values=(k, v))
+                def fill_tree():
+                    tree.delete(*tree.get_children())
+                    with instrument.stage("treeview", rows=len(info)):
+                        for k, v in info.items():
+                            tree.insert("", tk.END, values=(k, v))
+                fill_tree()
+                
+                def refresh(data_frame):
+                    nonlocal info
+                    new_info = features.info_player(data_frame, player_name)
+                    if new_info is not None:
+                        info = new_info
+                        fill_tree()
+                self.on_reload(player_win, refresh)
                 
                 tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
                 scroll_y.config(command=tree.yview)
@@ -163,12 +574,36 @@ class FIFAApp(tk.Tk):
                             webbrowser.open(str(values[1]))
                 tree.bind("<Double-1>", on_double_click)
                 
+                similar_frame = ttk.Frame(player_win)
+                similar_frame.pack(side=tk.BOTTOM, fill=tk.X, padx=10, pady=(0,10))
+                same_position_var = tk.BooleanVar(value=True)
+                ttk.Checkbutton(similar_frame, text="Posisi sama", variable=same_position_var)\
+                    .pack(side=tk.LEFT)
+                ttk.Button(similar_frame, text="Pemain Mirip",
+                           command=lambda: self.show_similar_players(info, same_position_var.get()))\
+                    .pack(side=tk.RIGHT)
+                
                 player_win.minsize(400, 300)
             win.destroy()
         
         ttk.Button(win, text="Tampilkan Info", command=on_select).pack(pady=5)
         win.minsize(300, 120)
         
+    @instrument.traced(name="Pemain Mirip")
+    def show_similar_players(self, info, same_position=True):
+        positions = [info['Position']] if same_position and info.get('Position') else None
+        similar_players = features.similar_players(self.data_frame, info['Name'], positions=positions)
+        if similar_players is None or similar_players.empty:
+            messagebox.showinfo("Pemain Mirip", "Tidak ada pemain mirip yang ditemukan.")
+            return
+        
+        win = tk.Toplevel(self)
+        win.title(f"Pemain Mirip: {info['Name']}")
+        with instrument.stage("treeview", rows=len(similar_players)):
+            table = widgets.VirtualTable(win, similar_players, column_width=100)
+        table.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        win.minsize(500, 300)
+        
     def show_info_team(self):
         if self.data_frame is None:
             messagebox.showwarning("Warning", "Data belum dimuat!")
@@ -178,9 +613,8 @@ class FIFAApp(tk.Tk):
         win.title("Info Team")
         
         ttk.Label(win, text="Masukkan atau pilih nama tim:").pack(pady=5)
-        try:
-            team_list = sorted(self.data_frame['Club'].dropna().unique().tolist())
-        except KeyError:
+        team_list = features.completion_index(self.data_frame, 'Club')
+        if team_list is None:
             messagebox.showerror("Error", "Kolom 'Club' tidak ditemukan.")
             win.destroy()
             return
@@ -189,6 +623,7 @@ class FIFAApp(tk.Tk):
         combo.set_completion_list(team_list)
         combo.pack(pady=5, padx=10, fill=tk.X)
         
+        @instrument.traced(name="Info Team")
         def on_select():
             team_name = combo.get().strip()
             team_data = features.info_team(self.data_frame, team_name)
@@ -200,38 +635,33 @@ class FIFAApp(tk.Tk):
                 
                 ttk.Label(team_win, text=f"Data untuk tim: {team_name}", style="Header.TLabel")\
                     .pack(pady=5)
-                frame_team = ttk.Frame(team_win)
-                frame_team.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
-                
-                scroll_y = ttk.Scrollbar(frame_team, orient="vertical")
-                scroll_y.pack(side=tk.RIGHT, fill=tk.Y)
-                scroll_x = ttk.Scrollbar(frame_team, orient="horizontal")
-                scroll_x.pack(side=tk.BOTTOM, fill=tk.X)
+                table = None
                 
-                tree = ttk.Treeview(frame_team,
-                                    columns=list(team_data.columns),
-                                    show="headings",
-                                    yscrollcommand=scroll_y.set,
-                                    xscrollcommand=scroll_x.set)
-                for col in team_data.columns:
-                    tree.heading(col, text=col)
-                    tree.column(col, width=100, anchor="center")
-                for _, row in team_data.iterrows():
-                    tree.insert("", tk.END, values=list(row))
+                def show_table(team_data):
+                    nonlocal table
+                    if table is not None:
+                        table.destroy()
+                    with instrument.stage("treeview", rows=len(team_data)):
+                        table = widgets.VirtualTable(team_win, team_data, column_width=100)
+                    table.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+                    tree = table.tree
+                    
+                    def on_double_click(event):
+                        item = tree.identify_row(event.y)
+                        if item:
+                            values = tree.item(item, "values")
+                            for cell in values:
+                                if str(cell).lower().startswith("http"):
+                                    webbrowser.open(str(cell))
+                                    break
+                    tree.bind("<Double-1>", on_double_click)
+                show_table(team_data)
                 
-                tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-                scroll_y.config(command=tree.yview)
-                scroll_x.config(command=tree.xview)
-                
-                def on_double_click(event):
-                    item = tree.identify_row(event.y)
-                    if item:
-                        values = tree.item(item, "values")
-                        for cell in values:
-                            if str(cell).lower().startswith("http"):
-                                webbrowser.open(str(cell))
-                                break
-                tree.bind("<Double-1>", on_double_click)
+                def refresh(data_frame):
+                    team_data = features.info_team(data_frame, team_name)
+                    if team_data is not None and not team_data.empty:
+                        show_table(team_data)
+                self.on_reload(team_win, refresh)
                 
                 team_win.minsize(500, 300)
             win.destroy()
@@ -244,23 +674,104 @@ class FIFAApp(tk.Tk):
             messagebox.showwarning("Warning", "Data belum dimuat!")
             return
         
-        extract_location = filedialog.asksaveasfilename(
-            title="Pilih lokasi untuk menyimpan summary",
-            defaultextension=".xlsx",
-            filetypes=[("Excel Files", "*.xlsx"), ("Excel Files", "*.xls"), ("All Files", "*.*")]
-        )
-        if not extract_location:
-            messagebox.showwarning("Peringatan", "Lokasi ekstrak tidak dipilih!")
-            return
+        sel_win = tk.Toplevel(self)
+        sel_win.title("Summary")
+        sel_win.resizable(False, False)
+        ttk.Label(sel_win, text="Pilih pengelompokan summary:")\
+            .grid(row=0, column=0, padx=10, pady=10, sticky="w")
+        group_vars = {}
+        for row, group in enumerate((None,) + export.GROUP_COLUMNS, start=1):
+            var = tk.BooleanVar(value=group is None)
+            check = ttk.Checkbutton(sel_win, text="Semua data" if group is None else f"Per {group}",
+                                    variable=var)
+            check.grid(row=row, column=0, padx=20, pady=2, sticky="w")
+            if group is not None and group not in self.data_frame.columns:
+                check.config(state="disabled")
+            group_vars[group] = var
         
-        summary_stats = features.summary(self.data_frame)
-        try:
-            if not isinstance(summary_stats, pd.DataFrame):
-                summary_stats = pd.DataFrame(summary_stats)
-            summary_stats.to_excel(extract_location, index=True)
-            messagebox.showinfo("Success", f"Summary berhasil disimpan di: {extract_location}")
-        except Exception as e:
-            messagebox.showerror("Error", f"Gagal menyimpan summary: {e}")
+        def on_export():
+            groups = tuple(group for group, var in group_vars.items() if var.get())
+            if not groups:
+                messagebox.showwarning("Warning", "Pilih minimal satu pengelompokan.")
+                return
+            extract_location = filedialog.asksaveasfilename(
+                title="Pilih lokasi untuk menyimpan summary",
+                defaultextension=".xlsx",
+                filetypes=[("Excel Files", "*.xlsx"), ("CSV Files", "*.csv"),
+                           ("Parquet Files", "*.parquet")]
+            )
+            if not extract_location:
+                messagebox.showwarning("Peringatan", "Lokasi ekstrak tidak dipilih!")
+                return
+            sel_win.destroy()
+            data_frame = self.data_frame
+            self.run_background(
+                "Menyimpan summary",
+                lambda progress, cancel_event: export.export_summary(
+                    data_frame, extract_location, groups, progress, cancel_event),
+                on_done=lambda paths: messagebox.showinfo(
+                    "Success", f"Summary berhasil disimpan di: {', '.join(paths)}"),
+                on_error=lambda e: messagebox.showerror("Error", f"Gagal menyimpan summary: {e}")
+            )
+        
+        ttk.Button(sel_win, text="Ekspor", command=on_export)\
+            .grid(row=len(group_vars) + 1, column=0, padx=10, pady=10, sticky="e")
+        sel_win.focus_force()
+        
+    def run_background(self, label, task, on_done=None, on_error=None):
+        """
+        Jalankan task(progress, cancel_event) di thread terpisah. Progres tampil
+        di status bar; on_done/on_error dipanggil di thread UI.
+        """
+        task_queue = queue.Queue()
+        cancel_event = threading.Event()
+        self._task_cancel = cancel_event
+        self.cancel_button.config(state="normal")
+        self.status_label.config(text=f"{label}... 0%")
+        
+        def worker():
+            try:
+                result = instrument.traced(task, name=label)(
+                    lambda frac: task_queue.put(("progress", frac)), cancel_event)
+                task_queue.put(("done", result))
+            except (load.LoadCancelled, export.ExportCancelled):
+                task_queue.put(("cancelled", None))
+            except Exception as e:
+                task_queue.put(("error", e))
+        
+        def poll():
+            while True:
+                try:
+                    kind, payload = task_queue.get_nowait()
+                except queue.Empty:
+                    self.after(100, poll)
+                    return
+                if kind == "progress":
+                    self.status_label.config(text=f"{label}... {payload:.0%}")
+                    continue
+                if self._task_cancel is cancel_event:
+                    self._task_cancel = None
+                if self._load_cancel is None and self._task_cancel is None:
+                    self.cancel_button.config(state="disabled")
+                if kind == "done":
+                    self.status_label.config(text=f"{label} selesai.")
+                    if on_done is not None:
+                        on_done(payload)
+                elif kind == "cancelled":
+                    self.status_label.config(text=f"{label} dibatalkan.")
+                else:
+                    self.status_label.config(text=str(payload))
+                    if on_error is not None:
+                        on_error(payload)
+                return
+        
+        threading.Thread(target=worker, daemon=True).start()
+        self.after(100, poll)
+    
+    def cancel_background(self):
+        self.cancel_load()
+        if self._task_cancel is not None:
+            self._task_cancel.set()
         
     def show_top_player(self):
         if self.data_frame is None:
@@ -288,9 +799,8 @@ class FIFAApp(tk.Tk):
         
         def update_combo(*args):
             if choice_var.get() == "position":
-                try:
-                    pos_list = sorted(self.data_frame['Position'].dropna().unique().tolist())
-                except KeyError:
+                pos_list = features.completion_index(self.data_frame, 'Position')
+                if pos_list is None:
                     messagebox.showerror("Error", "Kolom 'Position' tidak ditemukan.")
                     sel_win.destroy()
                     return
@@ -302,41 +812,44 @@ class FIFAApp(tk.Tk):
         choice_var.trace("w", update_combo)
         update_combo()
         
+        @instrument.traced(name="Top Player")
         def on_select():
-            if choice_var.get() == "overall":
-                top_players = features.top_player(self.data_frame)
-            else:
+            pos = None
+            if choice_var.get() != "overall":
                 pos = pos_combo.get().strip()
                 if not pos:
                     messagebox.showwarning("Warning", "Silakan pilih posisi terlebih dahulu.")
                     return
-                top_players = features.top_player_by_position(self.data_frame, pos)
+            
+            def compute(data_frame):
+                if pos is None:
+                    return features.top_player(data_frame)
+                return features.top_player_by_position(data_frame, pos)
+            top_players = compute(self.data_frame)
             if top_players is None or top_players.empty:
                 messagebox.showinfo("Top Player", "Data top player tidak tersedia.")
                 return
 
             res_win = tk.Toplevel(self)
             res_win.title("Top Players")
-            res_frame = ttk.Frame(res_win)
-            res_frame.grid(row=0, column=0, padx=10, pady=10, sticky="nsew")
-            res_win.rowconfigure(0, weight=1)
-            res_win.columnconfigure(0, weight=1)
+            res_frame = None
             
-            tree = ttk.Treeview(res_frame, columns=list(top_players.columns), show="headings")
-            tree.grid(row=0, column=0, sticky="nsew")
-            scroll_y = ttk.Scrollbar(res_frame, orient="vertical", command=tree.yview)
-            scroll_y.grid(row=0, column=1, sticky="ns")
-            scroll_x = ttk.Scrollbar(res_frame, orient="horizontal", command=tree.xview)
-            scroll_x.grid(row=1, column=0, sticky="ew")
-            tree.configure(yscrollcommand=scroll_y.set, xscrollcommand=scroll_x.set)
-            res_frame.rowconfigure(0, weight=1)
-            res_frame.columnconfigure(0, weight=1)
+            def show_table(top_players):
+                nonlocal res_frame
+                if res_frame is not None:
+                    res_frame.destroy()
+                with instrument.stage("treeview", rows=len(top_players)):
+                    res_frame = widgets.VirtualTable(res_win, top_players, column_width=100)
+                res_frame.grid(row=0, column=0, padx=10, pady=10, sticky="nsew")
+            show_table(top_players)
             
-            for col in top_players.columns:
-                tree.heading(col, text=col)
-                tree.column(col, width=100, anchor="center")
-            for row in top_players.itertuples(index=False):
-                tree.insert("", tk.END, values=list(row))
+            def refresh(data_frame):
+                top_players = compute(data_frame)
+                if top_players is not None and not top_players.empty:
+                    show_table(top_players)
+            self.on_reload(res_win, refresh)
+            res_win.rowconfigure(0, weight=1)
+            res_win.columnconfigure(0, weight=1)
             
             res_win.minsize(500, 300)
             sel_win.destroy()
@@ -345,6 +858,7 @@ class FIFAApp(tk.Tk):
             .grid(row=2, column=2, padx=10, pady=10, sticky="e")
         sel_win.focus_force()
         
+    @instrument.traced(name="Top Team")
     def show_top_team(self):
         if self.data_frame is None:
             messagebox.showwarning("Warning", "Data belum dimuat!")
@@ -357,32 +871,218 @@ class FIFAApp(tk.Tk):
         
         win = tk.Toplevel(self)
         win.title("Top Teams")
-        frame = ttk.Frame(win)
+        with instrument.stage("treeview", rows=len(top_teams)):
+            frame = widgets.VirtualTable(win, top_teams, column_width=150)
         frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
         
-        tree = ttk.Treeview(frame, columns=list(top_teams.columns), show="headings")
-        tree.grid(row=0, column=0, sticky="nsew")
-        scroll_y = ttk.Scrollbar(frame, orient="vertical", command=tree.yview)
-        scroll_y.grid(row=0, column=1, sticky="ns")
-        scroll_x = ttk.Scrollbar(frame, orient="horizontal", command=tree.xview)
-        scroll_x.grid(row=1, column=0, sticky="ew")
-        tree.configure(yscrollcommand=scroll_y.set, xscrollcommand=scroll_x.set)
-        frame.rowconfigure(0, weight=1)
-        frame.columnconfigure(0, weight=1)
-        
-        for col in top_teams.columns:
-            tree.heading(col, text=col)
-            tree.column(col, width=150, anchor="center")
-        for _, row in top_teams.iterrows():
-            tree.insert("", tk.END, values=list(row))
-            
+        def refresh(data_frame):
+            nonlocal frame
+            top_teams = features.top_team(data_frame)
+            if top_teams is None:
+                return
+            frame.destroy()
+            frame = widgets.VirtualTable(win, top_teams, column_width=150)
+            frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        self.on_reload(win, refresh)
+        
         win.minsize(500, 300)
         
+    def show_best_xi(self):
+        if self.data_frame is None:
+            messagebox.showwarning("Warning", "Data belum dimuat!")
+            return
+        
+        data_frame = self.data_frame
+        sel_win = tk.Toplevel(self)
+        sel_win.title("Best XI")
+        
+        ttk.Label(sel_win, text="Formasi:").grid(row=0, column=0, padx=10, pady=5, sticky="w")
+        formation_combo = ttk.Combobox(sel_win, values=list(squad.FORMATIONS), state="readonly", width=12)
+        formation_combo.set(squad.DEFAULT_FORMATION)
+        formation_combo.grid(row=0, column=1, padx=5, pady=5, sticky="w")
+        
+        scope_var = tk.StringVar(value="Club")
+        for column, (text, value) in enumerate([("Klub", "Club"), ("Negara", "Nation"), ("Semua pemain", "")]):
+            ttk.Radiobutton(sel_win, text=text, variable=scope_var, value=value)\
+                .grid(row=1, column=column, padx=10, pady=5, sticky="w")
+        value_combo = AutocompleteCombobox(sel_win, width=30)
+        value_combo.grid(row=2, column=0, columnspan=3, padx=10, pady=5, sticky="we")
+        
+        def update_scope(*args):
+            scope = scope_var.get()
+            if scope:
+                value_combo.set_completion_list(features.completion_index(data_frame, scope) or [])
+                value_combo.config(state="normal")
+            else:
+                value_combo.set("")
+                value_combo.config(state="disabled")
+        scope_var.trace_add("write", update_scope)
+        update_scope()
+        
+        def show_table(title, result, column_width):
+            res_win = tk.Toplevel(self)
+            res_win.title(title)
+            with instrument.stage("treeview", rows=len(result)):
+                table = widgets.VirtualTable(res_win, result, column_width=column_width)
+            table.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+            res_win.minsize(500, 300)
+        
+        @instrument.traced(name="Best XI")
+        def on_lineup():
+            scope, value = scope_var.get(), value_combo.get().strip()
+            if scope and not value:
+                messagebox.showwarning("Warning", "Silakan pilih klub/negara terlebih dahulu.")
+                return
+            formation = formation_combo.get()
+            lineup = features.best_xi(data_frame, formation,
+                                      club=value if scope == "Club" else None,
+                                      nation=value if scope == "Nation" else None)
+            if lineup is None or lineup.empty:
+                return
+            title = f"Best XI {formation}" + (f": {value}" if value else "")
+            show_table(f"{title} (rata-rata Fit {lineup['Fit'].mean():.1f})", lineup, 100)
+        
+        @instrument.traced(name="Peringkat Best XI")
+        def on_rank():
+            by = scope_var.get() or "Club"
+            ranked = features.top_team_xi(data_frame, top_n=len(data_frame),
+                                          formation=formation_combo.get(), by=by)
+            if ranked is None or ranked.empty:
+                messagebox.showinfo("Best XI", "Data peringkat tidak tersedia.")
+                return
+            show_table(f"Peringkat {by} ({formation_combo.get()})", ranked, 150)
+        
+        ttk.Button(sel_win, text="Tampilkan Best XI", command=on_lineup)\
+            .grid(row=3, column=0, padx=10, pady=10, sticky="w")
+        ttk.Button(sel_win, text="Peringkat Semua", command=on_rank)\
+            .grid(row=3, column=2, padx=10, pady=10, sticky="e")
+        sel_win.focus_force()
+    
+    def show_query(self):
+        if self.data_frame is None:
+            messagebox.showwarning("Warning", "Data belum dimuat!")
+            return
+        
+        data_frame = self.data_frame
+        engine = query.get_query_engine(data_frame)
+        columns = list(data_frame.columns)
+        win = tk.Toplevel(self)
+        win.title("Query Builder")
+        
+        conditions_frame = ttk.LabelFrame(win, text="Kondisi (digabung AND)")
+        conditions_frame.pack(fill=tk.X, padx=10, pady=5)
+        rows = []
+        
+        def set_value_choices(row):
+            try:
+                column = engine.column(row["column"].get())
+            except query.FilterError:
+                return
+            if engine.is_numeric(column):
+                row["value"].set_completion_list([])
+            else:
+                row["value"].set_completion_list(features.completion_index(data_frame, column) or [])
+        
+        def add_condition(column="Overall", op=">=", value=""):
+            frame = ttk.Frame(conditions_frame)
+            frame.pack(fill=tk.X, padx=5, pady=2)
+            row = {"frame": frame}
+            row["column"] = ttk.Combobox(frame, values=columns, state="readonly", width=16)
+            row["column"].set(column)
+            row["column"].pack(side=tk.LEFT, padx=2)
+            row["op"] = ttk.Combobox(frame, values=query.OPERATORS, state="readonly", width=8)
+            row["op"].set(op)
+            row["op"].pack(side=tk.LEFT, padx=2)
+            row["value"] = AutocompleteCombobox(frame, width=28)
+            row["value"].set(value)
+            row["value"].pack(side=tk.LEFT, padx=2, fill=tk.X, expand=True)
+            row["column"].bind("<<ComboboxSelected>>", lambda e: set_value_choices(row))
+            
+            def remove():
+                frame.destroy()
+                rows.remove(row)
+            ttk.Button(frame, text="Hapus", command=remove).pack(side=tk.LEFT, padx=2)
+            rows.append(row)
+            set_value_choices(row)
+        
+        options = ttk.Frame(win)
+        options.pack(fill=tk.X, padx=10, pady=5)
+        ttk.Button(options, text="Tambah Kondisi", command=add_condition).pack(side=tk.LEFT, padx=2)
+        ttk.Label(options, text="Urutkan:").pack(side=tk.LEFT, padx=(10, 2))
+        order_combo = ttk.Combobox(options, values=[""] + columns, state="readonly", width=16)
+        order_combo.set("Overall" if "Overall" in columns else "")
+        order_combo.pack(side=tk.LEFT, padx=2)
+        descending_var = tk.BooleanVar(value=True)
+        ttk.Checkbutton(options, text="Menurun", variable=descending_var).pack(side=tk.LEFT, padx=2)
+        ttk.Label(options, text="Limit:").pack(side=tk.LEFT, padx=(10, 2))
+        limit_var = tk.StringVar(value="200")
+        ttk.Spinbox(options, from_=0, to=100000, textvariable=limit_var, width=7).pack(side=tk.LEFT)
+        
+        # Teks query yang setara, bisa disalin ke CLI (python -m fifa query "...")
+        query_text = tk.StringVar()
+        ttk.Entry(win, textvariable=query_text, state="readonly").pack(fill=tk.X, padx=10, pady=5)
+        result_frame = ttk.Frame(win)
+        result_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
+        
+        def build_query():
+            conditions = []
+            for row in rows:
+                op = row["op"].get()
+                value = row["value"].get().strip()
+                if op in ("in", "not in"):
+                    value = tuple(v.strip() for v in value.split(",") if v.strip())
+                elif op == "between":
+                    value = tuple(v.strip() for v in value.split(",", 1))
+                    if len(value) != 2:
+                        raise query.FilterError("Nilai BETWEEN ditulis 'bawah, atas', misalnya '80, 90'.")
+                conditions.append(query.Condition(row["column"].get(), op, value))
+            try:
+                limit = int(limit_var.get()) if limit_var.get().strip() else None
+            except ValueError:
+                raise query.FilterError("Limit harus berupa bilangan bulat.")
+            order_by = ((order_combo.get(), descending_var.get()),) if order_combo.get() else ()
+            return query.Query(tuple(conditions), order_by, limit)
+        
+        @instrument.traced(name="Query")
+        def on_run():
+            try:
+                parsed = build_query()
+            except query.FilterError as e:
+                messagebox.showerror("Error", str(e))
+                return
+            query_text.set(query.to_text(parsed))
+            result = features.query(data_frame, parsed)
+            if result is None:
+                return
+            for child in result_frame.winfo_children():
+                child.destroy()
+            if result.empty:
+                ttk.Label(result_frame, text="Tidak ada pemain yang cocok.").pack(pady=10)
+            else:
+                with instrument.stage("treeview", rows=len(result)):
+                    table = widgets.VirtualTable(result_frame, result, column_width=100)
+                table.pack(fill=tk.BOTH, expand=True)
+            self.status_label.config(text=f"Query: {len(result)} pemain")
+        
+        def refresh(new_frame):
+            nonlocal data_frame, engine
+            data_frame, engine = new_frame, query.get_query_engine(new_frame)
+            if result_frame.winfo_children():
+                on_run()
+        self.on_reload(win, refresh)
+        
+        ttk.Button(options, text="Cari", command=on_run).pack(side=tk.RIGHT, padx=2)
+        add_condition()
+        win.minsize(700, 450)
+    
+    @instrument.traced(name="Visual Data")
     def show_visual_data(self):
         if self.data_frame is None:
             messagebox.showwarning("Warning", "Data belum dimuat!")
             return
-        features.visual_data(self.data_frame, self)
+        win = features.visual_data(self.data_frame, self)
+        if win is not None:
+            self.on_reload(win, win.set_data)
 
 if __name__ == "__main__":
     app = FIFAApp()
@@ -0,0 +1,311 @@
+"""
+Query majemuk untuk pencarian ala scouting, misalnya:
+
+    Nation = Brazil AND Position IN {ST, CF} AND Age < 23 AND Pace >= 85
+    ORDER BY Overall DESC LIMIT 50
+
+Kondisi kesetaraan/IN pada kolom teks dan kategori memakai mask boolean per
+nilai yang dibangun sekali (lewat codes kategori) lalu disimpan; kondisi
+rentang pada kolom angka (rating int8) dihitung vektor langsung pada array
+NumPy. Semua kondisi digabung dengan AND.
+"""
+import collections
+import re
+import numpy as np
+import pandas as pd
+import index
+
+OPERATORS = ("=", "!=", "<", "<=", ">", ">=", "in", "not in", "between")
+RANGE_OPERATORS = ("<", "<=", ">", ">=", "between")
+KEYWORDS = ("AND", "IN", "NOT", "BETWEEN", "ORDER", "BY", "ASC", "DESC", "LIMIT")
+
+Condition = collections.namedtuple("Condition", "column op value")
+Query = collections.namedtuple("Query", "conditions order_by limit")
+
+_TOKEN = re.compile(r"""\s*(?:
+    "(?P<dquote>[^"]*)" | '(?P<squote>[^']*)'
+    | [{(](?P<set>[^})]*)[})]
+    | (?P<op><=|>=|!=|<>|==|=|<|>)
+    | (?P<comma>,)
+    | (?P<word>[^\s"'{}()<>=!,]+)
+)""", re.VERBOSE)
+
+
+class FilterError(Exception):
+    pass
+
+
+def _tokenize(text):
+    tokens = []
+    pos = 0
+    text = text.strip()
+    while pos < len(text):
+        match = _TOKEN.match(text, pos)
+        if match is None or match.end() == pos:
+            raise FilterError(f"Query tidak valid di dekat: {text[pos:pos + 20]!r}")
+        pos = match.end()
+        kind = match.lastgroup
+        value = match.group(kind)
+        if kind in ("dquote", "squote"):
+            tokens.append(("str", value))
+        elif kind == "op":
+            tokens.append(("op", {"==": "=", "<>": "!="}.get(value, value)))
+        else:
+            tokens.append((kind, value))
+    return tokens
+
+
+def _split_set(text):
+    return tuple(item.strip().strip("\"'") for item in text.split(",") if item.strip())
+
+
+class _Parser:
+    def __init__(self, text):
+        self.tokens = _tokenize(text)
+        self.pos = 0
+
+    def peek(self):
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else (None, None)
+
+    def keyword(self, *words):
+        kind, value = self.peek()
+        return kind == "word" and value.upper() in words
+
+    def take(self):
+        token = self.peek()
+        self.pos += 1
+        return token
+
+    def expect_keyword(self, word):
+        if not self.keyword(word):
+            raise FilterError(f"Diharapkan '{word}' dalam query.")
+        self.take()
+
+    def words(self, stop):
+        # Nama kolom dan nilai boleh terdiri dari beberapa kata (misalnya 'Weak foot')
+        parts = []
+        while True:
+            kind, value = self.peek()
+            if kind == "str" and not parts:
+                self.take()
+                return value
+            if kind != "word" or value.upper() in stop:
+                break
+            parts.append(value)
+            self.take()
+        return " ".join(parts)
+
+    def condition(self):
+        column = self.words(("IN", "NOT", "BETWEEN"))
+        if not column:
+            raise FilterError("Nama kolom tidak ditemukan dalam kondisi.")
+        kind, value = self.peek()
+        if kind == "op":
+            self.take()
+            operand = self.words(("AND", "ORDER", "LIMIT"))
+            if operand == "":
+                raise FilterError(f"Nilai untuk kolom '{column}' kosong.")
+            return Condition(column, value, operand)
+        negate = self.keyword("NOT")
+        if negate:
+            self.take()
+        if self.keyword("IN"):
+            self.take()
+            kind, value = self.take()
+            if kind != "set":
+                raise FilterError("IN harus diikuti daftar nilai, misalnya {ST, CF}.")
+            return Condition(column, "not in" if negate else "in", _split_set(value))
+        if self.keyword("BETWEEN") and not negate:
+            self.take()
+            low = self.words(("AND",))
+            self.expect_keyword("AND")
+            high = self.words(("AND", "ORDER", "LIMIT"))
+            return Condition(column, "between", (low, high))
+        raise FilterError(f"Operator untuk kolom '{column}' tidak dikenal.")
+
+    def parse(self):
+        conditions = []
+        if not self.keyword("ORDER", "LIMIT") and self.peek()[0] is not None:
+            conditions.append(self.condition())
+            while self.keyword("AND"):
+                self.take()
+                conditions.append(self.condition())
+        order_by = []
+        if self.keyword("ORDER"):
+            self.take()
+            self.expect_keyword("BY")
+            while True:
+                column = self.words(("ASC", "DESC", "LIMIT"))
+                if not column:
+                    raise FilterError("Kolom ORDER BY kosong.")
+                descending = False
+                if self.keyword("ASC", "DESC"):
+                    descending = self.take()[1].upper() == "DESC"
+                order_by.append((column, descending))
+                if self.peek()[0] != "comma":
+                    break
+                self.take()
+        limit = None
+        if self.keyword("LIMIT"):
+            self.take()
+            kind, value = self.take()
+            try:
+                limit = int(value)
+            except (TypeError, ValueError):
+                raise FilterError("LIMIT harus berupa bilangan bulat.")
+        if self.peek()[0] is not None:
+            raise FilterError(f"Bagian query tidak dikenali: {self.peek()[1]!r}")
+        return Query(tuple(conditions), tuple(order_by), limit)
+
+
+def parse(text):
+    """Ubah teks query menjadi Query(conditions, order_by, limit)."""
+    return _Parser(text).parse()
+
+
+def _quote(value):
+    text = str(value)
+    if not text or re.search(r"[\s\"'{}(),<>=!]", text) or text.upper() in KEYWORDS:
+        return '"' + text.replace('"', "'") + '"'
+    return text
+
+
+def to_text(query):
+    """Kebalikan parse(): Query -> teks yang bisa diketik ulang (misalnya di CLI)."""
+    parts = []
+    for column, op, value in query.conditions:
+        if op in ("in", "not in"):
+            parts.append(f"{column} {op.upper()} {{{', '.join(_quote(v) for v in value)}}}")
+        elif op == "between":
+            parts.append(f"{column} BETWEEN {_quote(value[0])} AND {_quote(value[1])}")
+        else:
+            parts.append(f"{column} {op} {_quote(value)}")
+    text = " AND ".join(parts)
+    if query.order_by:
+        order = ", ".join(f"{column} {'DESC' if desc else 'ASC'}" for column, desc in query.order_by)
+        text += f" ORDER BY {order}"
+    if query.limit is not None:
+        text += f" LIMIT {query.limit}"
+    return text.strip()
+
+
+class QueryEngine:
+    """
+    Evaluasi Query atas satu DataFrame. Array kolom, indeks nilai dan mask per
+    nilai disimpan setelah dipakai pertama kali sehingga query berikutnya
+    hanya berupa operasi AND/perbandingan vektor.
+    """
+    def __init__(self, data_frame):
+        self.data_frame = data_frame
+        self._columns = {index.fold_case(col): col for col in data_frame.columns}
+        self._arrays = {}
+        self._value_indexes = {}
+        self._masks = {}
+        self._sort_keys = {}
+
+    def forget_columns(self, columns):
+        """Buang array, indeks nilai, mask dan kunci urut milik kolom yang berubah."""
+        for store in (self._arrays, self._value_indexes, self._sort_keys):
+            for column in columns:
+                store.pop(column, None)
+        self._masks = {k: v for k, v in self._masks.items() if k[0] not in columns}
+
+    def column(self, name):
+        column = self._columns.get(index.fold_case(str(name).strip()))
+        if column is None:
+            raise FilterError(f"Kolom '{name}' tidak ditemukan dalam data.")
+        return column
+
+    def is_numeric(self, column):
+        return pd.api.types.is_numeric_dtype(self.data_frame[column])
+
+    def _array(self, column):
+        if column not in self._arrays:
+            series = self.data_frame[column]
+            if series.dtype.kind in "iuf":
+                # Kolom int8/float32 dipakai langsung tanpa salinan
+                self._arrays[column] = series.to_numpy()
+            else:
+                self._arrays[column] = series.to_numpy(dtype=np.float64, na_value=np.nan)
+        return self._arrays[column]
+
+    def _number(self, column, value):
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            raise FilterError(f"Nilai '{value}' untuk kolom '{column}' harus berupa angka.")
+
+    def _value_mask(self, column, value):
+        key = (column, index.fold_case(value))
+        if key not in self._masks:
+            if self.is_numeric(column):
+                mask = self._array(column) == self._number(column, value)
+            else:
+                lookup = index.get_lookup_index(self.data_frame).columns.get(column)
+                if lookup is None:
+                    lookup = self._value_indexes.get(column)
+                    if lookup is None:
+                        lookup = index.ColumnIndex(self.data_frame[column])
+                        self._value_indexes[column] = lookup
+                mask = np.zeros(len(self.data_frame), dtype=bool)
+                mask[lookup.lookup(value)] = True
+            self._masks[key] = mask
+        return self._masks[key]
+
+    def mask(self, condition):
+        column = self.column(condition.column)
+        op, value = condition.op, condition.value
+        if op not in OPERATORS:
+            raise FilterError(f"Operator tidak dikenal: {op}")
+        if op in RANGE_OPERATORS:
+            if not self.is_numeric(column):
+                raise FilterError(f"Operator {op} hanya untuk kolom angka, bukan '{column}'.")
+            values = self._array(column)
+            if op == "between":
+                low, high = (self._number(column, v) for v in value)
+                return (values >= low) & (values <= high)
+            bound = self._number(column, value)
+            return {"<": np.less, "<=": np.less_equal,
+                    ">": np.greater, ">=": np.greater_equal}[op](values, bound)
+        if op in ("in", "not in"):
+            values = (value,) if isinstance(value, str) else tuple(value)
+            mask = np.zeros(len(self.data_frame), dtype=bool)
+            for item in values:
+                mask |= self._value_mask(column, item)
+        else:
+            mask = self._value_mask(column, value)
+        return ~mask if op in ("!=", "not in") else mask
+
+    def _sort_key(self, column):
+        # Kunci urut float64 per kolom; teks/kategori diurutkan alfabetis lewat factorize
+        if column not in self._sort_keys:
+            if self.is_numeric(column):
+                key = self._array(column).astype(np.float64)
+            else:
+                codes, _ = pd.factorize(self.data_frame[column], sort=True)
+                key = np.where(codes < 0, np.nan, codes).astype(np.float64)
+            self._sort_keys[column] = key
+        return self._sort_keys[column]
+
+    def run(self, query):
+        """Posisi baris (np.ndarray) yang memenuhi query, sudah terurut dan dibatasi."""
+        mask = None
+        for condition in query.conditions:
+            condition_mask = self.mask(condition)
+            mask = condition_mask if mask is None else mask & condition_mask
+        rows = np.arange(len(self.data_frame)) if mask is None else np.flatnonzero(mask)
+        if query.order_by:
+            keys = []
+            for name, descending in reversed(query.order_by):
+                key = self._sort_key(self.column(name))[rows]
+                key = -key if descending else key
+                # Nilai kosong selalu di akhir, baik ASC maupun DESC
+                keys.append(np.where(np.isnan(key), np.inf, key))
+            rows = rows[np.lexsort(keys)]
+        if query.limit is not None:
+            rows = rows[:max(query.limit, 0)]
+        return rows
+
+
+def get_query_engine(data_frame):
+    return index.get_derived(data_frame, "query", QueryEngine)
@@ -0,0 +1,117 @@
+import numpy as np
+import pandas as pd
+import index
+
+
+def metric_key(metric):
+    """Kunci hashable untuk metrik: nama kolom atau dict {kolom: bobot}."""
+    if isinstance(metric, str):
+        return metric
+    return tuple(sorted((str(col), float(w)) for col, w in dict(metric).items()))
+
+
+def metric_columns(metric):
+    return [metric] if isinstance(metric, str) else list(dict(metric).keys())
+
+
+def metric_label(metric):
+    return metric if isinstance(metric, str) else "Score"
+
+
+def top_positions(scores, candidates, top_n):
+    """Posisi top_n skor tertinggi di antara candidates; NaN selalu di akhir."""
+    values = scores[candidates]
+    values = np.where(np.isnan(values), -np.inf, values)
+    if top_n < len(candidates):
+        part = np.argpartition(-values, top_n - 1)[:top_n]
+    else:
+        part = np.arange(len(candidates))
+    # Urutkan hasil partisi: skor menurun, lalu urutan asli di data
+    order = np.lexsort((candidates[part], -values[part]))
+    return candidates[part[order]]
+
+
+class RankingEngine:
+    """
+    Mesin ranking untuk top player dan top team. Urutan Overall (total dan per
+    posisi) serta agregat per klub dihitung sekali dan disimpan; metrik lain
+    dihitung dengan argpartition tanpa sort penuh.
+    """
+    DEFAULT_METRIC = "Overall"
+
+    def __init__(self, data_frame):
+        self.data_frame = data_frame
+        self._scores = {}
+        self._orders = {}
+        self._clubs = {}
+        self._club_codes = None
+        if self.DEFAULT_METRIC in data_frame.columns:
+            self._orders[(self.DEFAULT_METRIC, None)] = self._full_order(self.DEFAULT_METRIC, None)
+            if "Position" in data_frame.columns:
+                position_index = index.get_lookup_index(data_frame).columns["Position"]
+                for key in position_index.keys():
+                    self._orders[(self.DEFAULT_METRIC, key)] = \
+                        self._full_order(self.DEFAULT_METRIC, position_index.lookup(key))
+
+    def scores(self, metric):
+        key = metric_key(metric)
+        if key not in self._scores:
+            if isinstance(metric, str):
+                values = self.data_frame[metric].to_numpy(dtype=np.float64, na_value=np.nan)
+            else:
+                values = np.zeros(len(self.data_frame), dtype=np.float64)
+                for col, weight in dict(metric).items():
+                    values += weight * self.data_frame[col].to_numpy(dtype=np.float64, na_value=np.nan)
+            self._scores[key] = values
+        return self._scores[key]
+
+    def _full_order(self, metric, candidates):
+        scores = self.scores(metric)
+        if candidates is None:
+            candidates = np.arange(len(scores))
+        values = np.where(np.isnan(scores[candidates]), -np.inf, scores[candidates])
+        return candidates[np.argsort(-values, kind="stable")]
+
+    def top_players(self, top_n=5, metric=DEFAULT_METRIC, position=None):
+        """Posisi baris top_n pemain, opsional dibatasi pada satu posisi."""
+        candidates = None
+        cache_key = None
+        if position is not None:
+            candidates = index.get_lookup_index(self.data_frame).lookup("Position", position)
+            cache_key = index.fold_case(position)
+        order = self._orders.get((metric_key(metric), cache_key))
+        if order is not None:
+            return order[:top_n]
+        if candidates is None:
+            candidates = np.arange(len(self.data_frame))
+        return top_positions(self.scores(metric), candidates, top_n)
+
+    def _club_aggregate(self, metric):
+        key = metric_key(metric)
+        if key not in self._clubs:
+            if self._club_codes is None:
+                club = self.data_frame["Club"]
+                if isinstance(club.dtype, pd.CategoricalDtype):
+                    self._club_codes = (club.cat.codes.to_numpy(), club.cat.categories)
+                else:
+                    self._club_codes = pd.factorize(club)
+            codes, names = self._club_codes
+            scores = self.scores(metric)
+            valid = (codes >= 0) & ~np.isnan(scores)
+            sums = np.bincount(codes[valid], weights=scores[valid], minlength=len(names))
+            counts = np.bincount(codes[valid], minlength=len(names))
+            squad = np.bincount(codes[codes >= 0], minlength=len(names))
+            with np.errstate(invalid="ignore", divide="ignore"):
+                means = sums / counts
+            self._clubs[key] = (np.asarray(names), means, squad)
+        return self._clubs[key]
+
+    def top_teams(self, top_n=5, metric=DEFAULT_METRIC, min_squad=1):
+        names, means, squad = self._club_aggregate(metric)
+        candidates = np.flatnonzero((squad >= min_squad) & ~np.isnan(means))
+        top = top_positions(means, candidates, top_n)
+        return pd.DataFrame({"Club": names[top], metric_label(metric): means[top]})
+
+
+def get_ranking_engine(data_frame):
+    return index.get_derived(data_frame, "ranking", RankingEngine)
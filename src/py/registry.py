@@ -0,0 +1,152 @@
+import os
+import re
+import numpy as np
+import pandas as pd
+import load
+import index
+
+ALL_DATASETS = "Semua dataset"
+
+
+class DatasetRegistry:
+    """
+    Menyimpan beberapa dataset yang sudah dimuat sekaligus, dikunci berdasarkan
+    path file. Kolom kategori (Nation, Club, Position, dll.) memakai kamus
+    kategori yang sama di semua dataset, sehingga gabungan antar dataset cukup
+    menyalin codes integer dan tetap bertipe category.
+    """
+    SHARED_COLUMNS = tuple(load.CATEGORY_COLUMNS)
+
+    def __init__(self):
+        self._datasets = {}
+        self._categories = {}
+        self._views = {}
+
+    def __contains__(self, key):
+        return key in self._datasets
+
+    def __len__(self):
+        return len(self._datasets)
+
+    def keys(self):
+        return list(self._datasets.keys())
+
+    def get(self, key):
+        return self._datasets[key]["frame"]
+
+    def info(self, key):
+        entry = self._datasets[key]
+        return {k: v for k, v in entry.items() if k != "frame"}
+
+    def label(self, key):
+        entry = self._datasets[key]
+        parts = [os.path.basename(key)]
+        if entry["season"]:
+            parts.append(str(entry["season"]))
+        if entry["gender"]:
+            parts.append(entry["gender"])
+        return " / ".join(parts)
+
+    @staticmethod
+    def key_for(file_path):
+        return os.path.abspath(file_path)
+
+    @staticmethod
+    def metadata_for(file_path):
+        """(season, gender) dari nama file, misalnya male_players_fc24.csv -> ('24', 'M')."""
+        name = os.path.basename(file_path).lower()
+        if re.search(r"female|women", name):
+            gender = "F"
+        elif re.search(r"(?<![a-z])(male|men)", name):
+            gender = "M"
+        else:
+            gender = None
+        return load.season_of(file_path), gender
+
+    def load(self, file_path, season=None, gender=None, **load_kwargs):
+        """Muat file (memakai cache biner) lalu daftarkan; kembalikan key-nya."""
+        data_frame = load.load_csv_data(file_path, **load_kwargs)
+        return self.add_file(data_frame, file_path, season=season, gender=gender)
+
+    def add_file(self, data_frame, file_path, season=None, gender=None):
+        """add() dengan key dari path; season/gender yang kosong diambil dari nama file."""
+        name_season, name_gender = self.metadata_for(file_path)
+        return self.add(data_frame, self.key_for(file_path),
+                        season=season or name_season, gender=gender or name_gender)
+
+    def add(self, data_frame, key, season=None, gender=None):
+        # Kolom Gender lebih dipercaya daripada tebakan dari nama file
+        if "Gender" in data_frame.columns:
+            genders = data_frame["Gender"].dropna().unique()
+            if len(genders) == 1:
+                gender = str(genders[0])
+        self._datasets[key] = {"frame": data_frame, "season": season, "gender": gender}
+        self._share_categories(data_frame)
+        self._views.clear()
+        return key
+
+    def keys_for(self, season=None, gender=None):
+        """Key dataset dengan season dan/atau gender tertentu (None = semua)."""
+        return [key for key, entry in self._datasets.items()
+                if (season is None or entry["season"] == season)
+                and (gender is None or entry["gender"] == gender)]
+
+    def remove(self, key):
+        self._datasets.pop(key, None)
+        self._views.clear()
+
+    def _share_categories(self, data_frame):
+        for col in self.SHARED_COLUMNS:
+            if col not in data_frame.columns or not isinstance(data_frame[col].dtype, pd.CategoricalDtype):
+                continue
+            current = self._categories.get(col)
+            new = data_frame[col].cat.categories
+            if current is None:
+                merged = new
+            elif new.isin(current).all():
+                merged = current
+            else:
+                merged = current.union(new)
+            self._categories[col] = merged
+            # Recode hanya dataset yang kategorinya belum sama; posisi baris tidak berubah
+            # sehingga indeks turunan (LookupIndex, RankingEngine) tetap valid
+            for entry in self._datasets.values():
+                frame = entry["frame"]
+                if col in frame.columns and isinstance(frame[col].dtype, pd.CategoricalDtype) \
+                        and not frame[col].cat.categories.equals(merged):
+                    frame[col] = frame[col].cat.set_categories(merged)
+
+    def union(self, keys=None):
+        """
+        Gabungan beberapa dataset (default semua) dengan kolom 'Dataset'.
+        Hasilnya disimpan sehingga pemanggilan berikutnya tidak menyalin ulang.
+        """
+        keys = tuple(self._datasets) if keys is None else tuple(keys)
+        if keys not in self._views:
+            frames = [self.get(key) for key in keys]
+            # Label dari codes (satu int per baris), bukan string Python per baris
+            labels = pd.Categorical.from_codes(
+                np.repeat(np.arange(len(keys)), [len(frame) for frame in frames]),
+                categories=list(keys))
+            view = pd.concat(frames, ignore_index=True)
+            view["Dataset"] = labels
+            self._views[keys] = view
+        return self._views[keys]
+
+    def select(self, column, value, keys=None):
+        """
+        Baris dengan column == value (Name/Club/Position) dari beberapa dataset,
+        memakai LookupIndex tiap dataset alih-alih menggabungkan semuanya dulu.
+        """
+        keys = tuple(self._datasets) if keys is None else tuple(keys)
+        parts = []
+        for key in keys:
+            frame = self.get(key)
+            positions = index.get_lookup_index(frame).lookup(column, value)
+            if len(positions):
+                parts.append(frame.iloc[positions].assign(Dataset=key))
+        if not parts:
+            return None
+        result = pd.concat(parts, ignore_index=True)
+        result["Dataset"] = pd.Categorical(result["Dataset"], categories=list(keys))
+        return result
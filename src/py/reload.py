@@ -0,0 +1,263 @@
+"""
+Reload inkremental: deteksi perubahan file CSV sumber lalu terapkan hanya
+baris yang berubah.
+
+Saat data dimuat, setiap baris mentah CSV di-hash dan dipetakan ke kunci
+pemain (kolom URL). Ketika file berubah, baris yang hash-nya masih sama
+dipakai ulang dari DataFrame lama; hanya baris baru/berubah yang di-parse.
+Hasilnya berupa Delta (insert/update/delete per URL):
+
+- hanya update: nilai diubah langsung di DataFrame yang sama, dan struktur
+  turunan (indeks, ranking, chart, cache query) hanya dibuang untuk kolom
+  yang benar-benar berubah;
+- ada insert/delete: DataFrame baru disusun dari baris lama + baris yang
+  di-parse (satu kali take, tanpa parse ulang seluruh file).
+"""
+import io
+import os
+import threading
+import numpy as np
+import pandas as pd
+import load
+import index
+import cache
+
+KEY_COLUMN = 'URL'
+
+
+class ReloadError(Exception):
+    pass
+
+
+def file_stamp(file_path):
+    """(ukuran, mtime) file; dipakai untuk mendeteksi file yang berubah."""
+    stat = os.stat(file_path)
+    return stat.st_size, stat.st_mtime_ns
+
+
+def _read_lines(file_path):
+    with open(file_path, "rb") as f:
+        raw = f.read()
+    lines = raw.splitlines()
+    if not lines:
+        raise ReloadError("File CSV kosong.")
+    header, body = lines[0], [line for line in lines[1:] if line.strip()]
+    # Kolom indeks di depan ("0,Kylian Mbappé,...") bergeser saat ada baris
+    # disisipkan, jadi tidak ikut di-hash
+    skip_index = load._is_index_column(header.split(b",", 1)[0].decode("utf-8", "replace").strip())
+    keys = [line.split(b",", 1)[-1] for line in body] if skip_index else body
+    hashes = np.fromiter((hash(line) for line in keys), dtype=np.int64, count=len(keys))
+    return header, body, hashes
+
+
+class Snapshot:
+    """Hash tiap baris CSV dan kunci pemainnya, sejajar dengan baris DataFrame."""
+    def __init__(self, header, hashes, keys):
+        self.header = header
+        self.hashes = hashes
+        self.keys = keys
+        self.position_of_hash = dict(zip(hashes.tolist(), range(len(hashes))))
+        self.position_of_key = dict(zip(keys.tolist(), range(len(keys))))
+
+
+class Delta:
+    """Perubahan antara DataFrame lama dan isi file terbaru."""
+    def __init__(self, inserted, updated, deleted, columns, frame=None, snapshot=None, stamp=None):
+        self.inserted = inserted        # DataFrame baris baru
+        self.updated = updated          # DataFrame nilai baru, index = posisi baris lama
+        self.deleted = deleted          # posisi baris lama yang dihapus
+        self.columns = columns          # kolom yang nilainya berubah pada baris update
+        self.frame = frame              # DataFrame baru jika ada insert/delete
+        self.snapshot = snapshot
+        self.stamp = stamp
+
+    @property
+    def empty(self):
+        return len(self.inserted) == 0 and len(self.updated) == 0 and len(self.deleted) == 0
+
+    @property
+    def in_place(self):
+        return self.frame is None
+
+    def describe(self):
+        return f"{len(self.inserted)} baru, {len(self.updated)} berubah, {len(self.deleted)} dihapus"
+
+
+def _values(series):
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return series.astype(object).to_numpy()
+    return series.to_numpy()
+
+
+def _differs(old, new):
+    old, new = _values(old), _values(new)
+    different = old != new
+    # NaN dianggap sama dengan NaN
+    both_missing = pd.isna(old) & pd.isna(new)
+    return np.asarray(different & ~both_missing, dtype=bool)
+
+
+def _can_assign(series, values):
+    """Nilai baru bisa ditulis di tempat tanpa mengubah dtype kolom?"""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return True
+    if series.dtype.kind in "iu":
+        if values.isna().any():
+            return False
+        info = np.iinfo(series.dtype)
+        return bool(values.min() >= info.min and values.max() <= info.max)
+    if series.dtype.kind == "f":
+        return pd.api.types.is_numeric_dtype(values)
+    return True
+
+
+class SourceWatcher:
+    """
+    Memantau satu file CSV untuk satu DataFrame. Saat dibuat hanya stempel
+    file yang disimpan; snapshot hash baris (membaca ulang seluruh file)
+    baru dibuat lewat prepare() ketika pemantauan diaktifkan. poll() boleh
+    dijalankan di thread lain (tidak mengubah DataFrame); apply() dijalankan
+    di thread yang memakai DataFrame (thread UI).
+    """
+    def __init__(self, file_path, data_frame, key_column=KEY_COLUMN, stamp=None):
+        self.file_path = file_path
+        self.key_column = key_column
+        self.data_frame = data_frame
+        self.snapshot = None
+        self.stamp = stamp or file_stamp(file_path)
+        self._lock = threading.Lock()
+        # Baris hanya bisa dicocokkan lewat kunci yang terisi dan unik
+        keys = data_frame[key_column] if key_column in data_frame.columns else None
+        self.supported = keys is not None and not keys.isna().any() and keys.is_unique
+
+    def prepare(self):
+        """
+        Buat snapshot hash baris jika belum ada. Mengembalikan False jika
+        snapshot tidak bisa dibuat: file sudah berubah sejak dimuat, atau baris
+        CSV tidak sejajar dengan baris DataFrame (newline di dalam kutipan).
+        """
+        with self._lock:
+            if self.snapshot is not None:
+                return True
+            if not self.supported:
+                return False
+            header, _, hashes = _read_lines(self.file_path)
+            if file_stamp(self.file_path) != self.stamp:
+                return False
+            if len(hashes) != len(self.data_frame):
+                self.supported = False
+                return False
+            self.snapshot = Snapshot(header, hashes, self.data_frame[self.key_column].to_numpy())
+            return True
+
+    def changed(self):
+        try:
+            return file_stamp(self.file_path) != self.stamp
+        except OSError:
+            return False
+
+    def poll(self):
+        """
+        Hitung Delta terhadap isi file sekarang. Melempar ReloadError jika
+        perubahan tidak bisa diterapkan inkremental (perlu muat ulang penuh).
+        """
+        if not self.supported:
+            raise ReloadError(f"Reload inkremental membutuhkan kolom {self.key_column} yang unik per baris.")
+        if self.snapshot is None and not self.prepare():
+            raise ReloadError("File berubah sebelum pemantauan aktif; data perlu dimuat ulang penuh.")
+        stamp = file_stamp(self.file_path)
+        header, body, hashes = _read_lines(self.file_path)
+        old = self.snapshot
+        if header != old.header:
+            raise ReloadError("Header CSV berubah; data perlu dimuat ulang penuh.")
+
+        known = np.fromiter((h in old.position_of_hash for h in hashes.tolist()),
+                            dtype=bool, count=len(hashes))
+        changed_lines = [body[i] for i in np.flatnonzero(~known)]
+        if changed_lines:
+            parsed = load._apply_schema(pd.read_csv(
+                io.BytesIO(header + b"\n" + b"\n".join(changed_lines)), **load._read_kwargs()))
+            if len(parsed) != len(changed_lines):
+                raise ReloadError("Baris CSV yang berubah tidak bisa di-parse satu per satu.")
+        else:
+            parsed = self.data_frame.iloc[:0]
+
+        # Posisi sumber tiap baris file baru: baris lama (hash sama) atau baris hasil parse
+        source = np.empty(len(hashes), dtype=np.int64)
+        known_positions = np.fromiter((old.position_of_hash[h] for h in hashes[known].tolist()),
+                                      dtype=np.int64, count=int(known.sum()))
+        source[known] = known_positions
+        source[~known] = len(self.data_frame) + np.arange(len(parsed))
+
+        new_keys = np.empty(len(hashes), dtype=object)
+        new_keys[known] = old.keys[known_positions]
+        new_keys[~known] = parsed[self.key_column].to_numpy()
+        if pd.isna(new_keys).any() or len(set(new_keys.tolist())) != len(new_keys):
+            raise ReloadError(f"Kolom {self.key_column} kosong atau duplikat; data perlu dimuat ulang penuh.")
+
+        parsed_old = np.array([old.position_of_key.get(k, -1) for k in parsed[self.key_column].tolist()],
+                              dtype=np.int64)
+        is_update = parsed_old >= 0
+        inserted = parsed[~is_update]
+        updated = parsed[is_update].set_axis(parsed_old[is_update])
+        kept = np.zeros(len(self.data_frame), dtype=bool)
+        kept[known_positions] = True
+        kept[parsed_old[is_update]] = True
+        deleted = np.flatnonzero(~kept)
+
+        columns = []
+        if len(updated):
+            current = self.data_frame.iloc[updated.index]
+            for col in self.data_frame.columns:
+                if col in updated.columns and _differs(current[col], updated[col]).any():
+                    columns.append(col)
+            # Baris yang hanya berubah format (nilai sama) tidak dihitung sebagai update
+            same = np.ones(len(updated), dtype=bool)
+            for col in columns:
+                same &= ~_differs(current[col], updated[col])
+            updated = updated[~same]
+
+        snapshot = Snapshot(header, hashes, new_keys)
+        delta = Delta(inserted, updated, deleted, columns, snapshot=snapshot, stamp=stamp)
+        needs_rebuild = len(inserted) or len(deleted) or list(parsed.columns) != list(self.data_frame.columns) \
+            or not all(_can_assign(self.data_frame[col], updated[col]) for col in columns)
+        if needs_rebuild:
+            # Satu take dari baris lama + baris hasil parse, urut seperti di file
+            delta.frame = load.reconcile_frames([self.data_frame, parsed]).take(source).reset_index(drop=True)
+        else:
+            # DataFrame tetap dipakai: snapshot disusun mengikuti posisi barisnya,
+            # walaupun urutan baris di file berubah
+            target = source.copy()
+            target[~known] = parsed_old
+            aligned_hashes = np.empty_like(hashes)
+            aligned_hashes[target] = hashes
+            aligned_keys = np.empty(len(target), dtype=object)
+            aligned_keys[target] = new_keys
+            delta.snapshot = Snapshot(header, aligned_hashes, aligned_keys)
+        return delta
+
+    def apply(self, delta):
+        """
+        Terapkan delta; mengembalikan DataFrame hasil (objek yang sama jika
+        perubahannya hanya update, objek baru jika ada insert/delete).
+        """
+        data_frame = self.data_frame
+        if delta.frame is not None:
+            data_frame = delta.frame
+        elif len(delta.updated):
+            rows = delta.updated.index.to_numpy()
+            cache.bump(data_frame)
+            for col in delta.columns:
+                values = delta.updated[col]
+                series = data_frame[col]
+                if isinstance(series.dtype, pd.CategoricalDtype):
+                    missing = pd.Index(values.dropna().astype(object).unique()).difference(series.cat.categories)
+                    if len(missing):
+                        data_frame[col] = series.cat.add_categories(missing)
+                    values = values.astype(object)
+                data_frame.iloc[rows, data_frame.columns.get_loc(col)] = values.to_numpy()
+            index.invalidate_columns(data_frame, delta.columns)
+        self.data_frame = data_frame
+        self.snapshot = delta.snapshot
+        self.stamp = delta.stamp
+        return data_frame
@@ -0,0 +1,79 @@
+from bisect import bisect_left
+import numpy as np
+from index import fold_accents
+
+
+def _prefix_range(sorted_keys, prefix):
+    start = bisect_left(sorted_keys, prefix)
+    # '\U0010ffff' adalah code point terbesar, jadi semua string berawalan prefix < batas ini
+    end = bisect_left(sorted_keys, prefix + "\U0010ffff", lo=start)
+    return start, end
+
+
+class PrefixIndex:
+    """
+    Indeks pencarian untuk autocomplete. Mendukung pencocokan prefix nama lengkap,
+    prefix per kata ("haal" -> "Erling Haaland") dan substring, semuanya
+    case-insensitive dan tanpa aksen.
+    """
+    def __init__(self, items):
+        # Urutan tampilan mengikuti urutan alfabet case-insensitive
+        self.items = sorted(set(items), key=str.lower)
+        folded = [fold_accents(item) for item in self.items]
+        self._folded = folded
+
+        order = sorted(range(len(folded)), key=folded.__getitem__)
+        self._full_keys = [folded[i] for i in order]
+        self._full_ids = np.array(order, dtype=np.int32)
+
+        tokens = [(token, i) for i, key in enumerate(folded) for token in key.split()[1:]]
+        tokens.sort()
+        self._token_keys = [t for t, _ in tokens]
+        self._token_ids = np.array([i for _, i in tokens], dtype=np.int32)
+
+        # Semua kunci digabung jadi satu string agar pencarian substring
+        # memakai str.find (C) alih-alih loop Python per item
+        self._haystack = "\n".join(folded)
+        self._offsets = np.cumsum([0] + [len(key) + 1 for key in folded[:-1]]) \
+            if folded else np.empty(0, dtype=np.int64)
+
+    def _substring_ids(self, query, limit):
+        ids = []
+        pos = self._haystack.find(query)
+        while pos != -1 and len(ids) < limit:
+            i = int(np.searchsorted(self._offsets, pos, side="right")) - 1
+            ids.append(i)
+            # Lompat ke item berikutnya agar satu item tidak dihitung dua kali
+            next_start = self._offsets[i + 1] if i + 1 < len(self._offsets) else len(self._haystack)
+            pos = self._haystack.find(query, next_start)
+        return ids
+
+    def search(self, text, limit=50, substring=True):
+        query = fold_accents(text).strip()
+        if not query:
+            return self.items[:limit]
+
+        start, end = _prefix_range(self._full_keys, query)
+        groups = [self._full_ids[start:end]]
+        start, end = _prefix_range(self._token_keys, query)
+        groups.append(self._token_ids[start:end])
+
+        result, seen = [], set()
+        for ids in groups:
+            for i in np.sort(ids):
+                if i not in seen:
+                    seen.add(i)
+                    result.append(i)
+                    if len(result) >= limit:
+                        return [self.items[i] for i in result]
+        if substring:
+            for i in self._substring_ids(query, limit + len(seen)):
+                if i not in seen:
+                    seen.add(i)
+                    result.append(i)
+                    if len(result) >= limit:
+                        break
+        return [self.items[i] for i in result]
+
+    def __len__(self):
+        return len(self.items)
@@ -0,0 +1,96 @@
+import numpy as np
+import load
+import index
+
+# Atribut detail dari Pace sampai Aggression
+ATTRIBUTE_COLUMNS = load.RATING_COLUMNS[
+    load.RATING_COLUMNS.index('Pace'):load.RATING_COLUMNS.index('Aggression') + 1
+]
+METRICS = ("cosine", "euclidean")
+
+
+class SimilarityIndex:
+    """
+    Matriks atribut float32 yang sudah dinormalisasi (z-score per kolom) untuk
+    pencarian k-nearest-neighbor. Semua perhitungan dilakukan per blok query
+    dengan perkalian matriks NumPy, tanpa loop per baris.
+    """
+    BLOCK_SIZE = 512
+
+    def __init__(self, data_frame):
+        self.columns = [col for col in ATTRIBUTE_COLUMNS if col in data_frame.columns]
+        self.depends_on = self.columns + ["Position"]
+        matrix = data_frame[self.columns].to_numpy(dtype=np.float32, na_value=np.nan)
+        mean = np.nanmean(matrix, axis=0)
+        std = np.nanstd(matrix, axis=0)
+        std[std == 0] = 1
+        matrix = (matrix - mean) / std
+        # Nilai kosong dianggap rata-rata (0 setelah standarisasi)
+        matrix[np.isnan(matrix)] = 0
+        self.matrix = matrix
+        self.sq_norms = np.einsum("ij,ij->i", matrix, matrix)
+        norms = np.sqrt(self.sq_norms)
+        norms[norms == 0] = 1
+        self.unit = matrix / norms[:, None]
+
+        self.position_masks = {}
+        if "Position" in data_frame.columns:
+            position_index = index.get_lookup_index(data_frame).columns["Position"]
+            for key in position_index.keys():
+                mask = np.zeros(len(data_frame), dtype=bool)
+                mask[position_index.lookup(key)] = True
+                self.position_masks[key] = mask
+
+    def mask_for(self, positions):
+        """Mask boolean untuk daftar posisi (None = semua pemain)."""
+        if not positions:
+            return None
+        mask = np.zeros(len(self.matrix), dtype=bool)
+        for position in positions:
+            position_mask = self.position_masks.get(index.fold_case(position))
+            if position_mask is not None:
+                mask |= position_mask
+        return mask
+
+    def query(self, rows, k=10, metric="cosine", mask=None, exclude_self=True):
+        """
+        Tetangga terdekat untuk banyak baris sekaligus. Mengembalikan
+        (neighbors, scores) berbentuk (len(rows), k); skor berupa cosine
+        similarity (makin besar makin mirip) atau jarak Euclidean (makin kecil
+        makin mirip). Slot kosong bernilai -1.
+        """
+        if metric not in METRICS:
+            raise ValueError(f"Metrik tidak dikenal: {metric}")
+        rows = np.asarray(rows, dtype=np.int64)
+        neighbors = np.full((len(rows), k), -1, dtype=np.int64)
+        scores = np.full((len(rows), k), np.nan, dtype=np.float32)
+        for start in range(0, len(rows), self.BLOCK_SIZE):
+            block = rows[start:start + self.BLOCK_SIZE]
+            if metric == "cosine":
+                # Dinegasikan supaya "lebih kecil = lebih mirip" untuk kedua metrik
+                cost = -(self.unit[block] @ self.unit.T)
+            else:
+                cost = self.sq_norms[block, None] + self.sq_norms[None, :] \
+                    - 2 * (self.matrix[block] @ self.matrix.T)
+            if mask is not None:
+                cost[:, ~mask] = np.inf
+            if exclude_self:
+                cost[np.arange(len(block)), block] = np.inf
+            kk = min(k, cost.shape[1])
+            part = np.argpartition(cost, kk - 1, axis=1)[:, :kk]
+            part_cost = np.take_along_axis(cost, part, axis=1)
+            order = np.argsort(part_cost, axis=1, kind="stable")
+            best = np.take_along_axis(part, order, axis=1)
+            best_cost = np.take_along_axis(part_cost, order, axis=1)
+            valid = np.isfinite(best_cost)
+            out = slice(start, start + len(block))
+            neighbors[out, :kk] = np.where(valid, best, -1)
+            if metric == "cosine":
+                scores[out, :kk] = np.where(valid, -best_cost, np.nan)
+            else:
+                scores[out, :kk] = np.where(valid, np.sqrt(np.maximum(best_cost, 0)), np.nan)
+        return neighbors, scores
+
+
+def get_similarity_index(data_frame):
+    return index.get_derived(data_frame, "similarity", SimilarityIndex)
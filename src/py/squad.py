@@ -0,0 +1,240 @@
+"""
+Best XI per formasi untuk satu klub, satu negara atau seluruh pemain.
+
+Setiap pemain diberi nilai kecocokan untuk tiap slot formasi: rating dikurangi
+penalti jika posisi aslinya berbeda (misalnya CF di slot ST). Susunan terbaik
+dicari dengan algoritma Hungarian (versi shortest augmenting path) yang
+dijalankan serentak untuk banyak grup sekaligus dengan NumPy, sehingga semua
+klub bisa diperingkat dalam satu pass.
+"""
+import numpy as np
+import pandas as pd
+import index
+import ranking
+
+FORMATIONS = {
+    "4-3-3": ("GK", "LB", "CB", "CB", "RB", "CDM", "CM", "CM", "LW", "ST", "RW"),
+    "4-4-2": ("GK", "LB", "CB", "CB", "RB", "LM", "CM", "CM", "RM", "ST", "ST"),
+    "4-2-3-1": ("GK", "LB", "CB", "CB", "RB", "CDM", "CDM", "LM", "CAM", "RM", "ST"),
+    "4-1-2-1-2": ("GK", "LB", "CB", "CB", "RB", "CDM", "CM", "CM", "CAM", "ST", "ST"),
+    "3-5-2": ("GK", "CB", "CB", "CB", "LWB", "CM", "CDM", "CM", "RWB", "ST", "ST"),
+    "3-4-3": ("GK", "CB", "CB", "CB", "LM", "CM", "CM", "RM", "LW", "ST", "RW"),
+    "5-3-2": ("GK", "LWB", "CB", "CB", "CB", "RWB", "CM", "CDM", "CM", "ST", "ST"),
+}
+DEFAULT_FORMATION = "4-3-3"
+
+# Penalti rating saat pemain dimainkan di luar posisi aslinya (slot -> posisi pemain)
+POSITION_PENALTY = {
+    "ST": {"CF": 1, "LW": 4, "RW": 4, "CAM": 5},
+    "CF": {"ST": 1, "CAM": 2, "LW": 3, "RW": 3},
+    "LW": {"LM": 1, "CF": 3, "RW": 3, "ST": 4, "CAM": 4},
+    "RW": {"RM": 1, "CF": 3, "LW": 3, "ST": 4, "CAM": 4},
+    "LM": {"LW": 1, "LWB": 3, "RM": 3, "CM": 4},
+    "RM": {"RW": 1, "RWB": 3, "LM": 3, "CM": 4},
+    "CAM": {"CF": 2, "CM": 2, "LW": 5, "RW": 5},
+    "CM": {"CAM": 2, "CDM": 2, "LM": 4, "RM": 4},
+    "CDM": {"CM": 2, "CB": 4},
+    "CB": {"CDM": 4, "LB": 5, "RB": 5},
+    "LB": {"LWB": 1, "RB": 3, "CB": 4, "LM": 5},
+    "RB": {"RWB": 1, "LB": 3, "CB": 4, "RM": 5},
+    "LWB": {"LB": 1, "LM": 2, "RWB": 3, "LW": 4},
+    "RWB": {"RB": 1, "RM": 2, "LWB": 3, "RW": 4},
+}
+# Penalti pemain lapangan di posisi yang tidak terkait; kiper tidak pernah ditukar
+OUT_OF_POSITION_PENALTY = 15
+# Biaya slot yang tidak bisa diisi (grup kekurangan pemain atau tidak punya kiper)
+_UNFILLED = 1e6
+
+
+def solve_assignment(cost):
+    """
+    Algoritma Hungarian untuk banyak matriks biaya sekaligus.
+    cost berbentuk (grup, n, m) dengan n <= m; mengembalikan kolom terpilih
+    untuk tiap baris, berbentuk (grup, n), dengan total biaya minimum.
+    """
+    cost = np.asarray(cost, dtype=np.float64)
+    if cost.ndim == 2:
+        return solve_assignment(cost[None])[0]
+    groups, n, m = cost.shape
+    if n > m:
+        raise ValueError("Jumlah baris tidak boleh melebihi jumlah kolom.")
+    # Indeks 0 dipakai sebagai baris/kolom semu seperti pada formulasi aslinya
+    a = np.zeros((groups, n + 1, m + 1))
+    a[:, 1:, 1:] = cost
+    u = np.zeros((groups, n + 1))
+    v = np.zeros((groups, m + 1))
+    p = np.zeros((groups, m + 1), dtype=np.int64)
+    way = np.zeros((groups, m + 1), dtype=np.int64)
+    for i in range(1, n + 1):
+        p[:, 0] = i
+        j0 = np.zeros(groups, dtype=np.int64)
+        minv = np.full((groups, m + 1), np.inf)
+        used = np.zeros((groups, m + 1), dtype=bool)
+        active = np.arange(groups)
+        while len(active):
+            g = active
+            jg = j0[g]
+            used[g, jg] = True
+            i0 = p[g, jg]
+            cur = a[g, i0, :] - u[g, i0][:, None] - v[g]
+            used_g = used[g]
+            improve = ~used_g & (cur < minv[g])
+            minv[g] = np.where(improve, cur, minv[g])
+            way[g] = np.where(improve, jg[:, None], way[g])
+            candidates = np.where(used_g, np.inf, minv[g])
+            j1 = np.argmin(candidates, axis=1)
+            delta = candidates[np.arange(len(g)), j1]
+            rows, cols = np.nonzero(used_g)
+            np.add.at(u, (g[rows], p[g[rows], cols]), delta[rows])
+            v[g] -= np.where(used_g, delta[:, None], 0)
+            minv[g] -= np.where(used_g, 0, delta[:, None])
+            j0[g] = j1
+            active = g[p[g, j1] != 0]
+        # Jalur augmentasi dibalik untuk semua grup sekaligus
+        current = j0.copy()
+        pending = np.flatnonzero(current)
+        while len(pending):
+            previous = way[pending, current[pending]]
+            p[pending, current[pending]] = p[pending, previous]
+            current[pending] = previous
+            pending = pending[previous != 0]
+    assignment = np.zeros((groups, n), dtype=np.int64)
+    g, j = np.nonzero(p[:, 1:])
+    assignment[g, p[g, j + 1] - 1] = j
+    return assignment
+
+
+class SquadBuilder:
+    """
+    Nilai kecocokan pemain per slot formasi dan pencarian best XI. Matriks
+    kecocokan (pemain x slot) dihitung sekali per formasi dan metrik.
+    """
+    def __init__(self, data_frame):
+        self.data_frame = data_frame
+        positions = data_frame["Position"]
+        if not isinstance(positions.dtype, pd.CategoricalDtype):
+            positions = positions.astype("category")
+        self._position_codes = positions.cat.codes.to_numpy()
+        self._positions = [str(c).upper() for c in positions.cat.categories]
+        self._fits = {}
+
+    def _penalties(self, slots):
+        # Tabel (kategori posisi x slot); NaN = tidak boleh (kiper <-> pemain lapangan)
+        table = np.full((len(self._positions) + 1, len(slots)), np.nan)
+        for s, slot in enumerate(slots):
+            for c, position in enumerate(self._positions):
+                if position == slot:
+                    table[c, s] = 0
+                elif "GK" not in (position, slot):
+                    table[c, s] = POSITION_PENALTY.get(slot, {}).get(position, OUT_OF_POSITION_PENALTY)
+        return table
+
+    def fit(self, formation=DEFAULT_FORMATION, metric="Overall"):
+        """Matriks (pemain x slot) berisi rating dikurangi penalti; NaN = tidak cocok."""
+        key = (formation, ranking.metric_key(metric))
+        if key not in self._fits:
+            slots = self.slots(formation)
+            ratings = ranking.get_ranking_engine(self.data_frame).scores(metric)
+            # Kode -1 (posisi kosong) jatuh ke baris terakhir tabel yang berisi NaN
+            self._fits[key] = ratings[:, None] - self._penalties(slots)[self._position_codes]
+        return self._fits[key]
+
+    @staticmethod
+    def slots(formation):
+        if formation not in FORMATIONS:
+            raise ValueError(f"Formasi tidak dikenal: {formation}")
+        return FORMATIONS[formation]
+
+    def _candidates(self, fit, group_codes, n_groups):
+        """
+        Kandidat per grup: pemain yang masuk 11 besar untuk setidaknya satu
+        slot. Susunan optimal selalu berada di antara kandidat ini, jadi
+        matriks biaya tetap kecil walaupun grupnya seluruh pemain.
+        """
+        n_slots = fit.shape[1]
+        keep = np.zeros(len(fit), dtype=bool)
+        valid_group = group_codes >= 0
+        for s in range(n_slots):
+            values = fit[:, s]
+            ok = valid_group & ~np.isnan(values)
+            rows = np.flatnonzero(ok)
+            order = rows[np.lexsort((-values[rows], group_codes[rows]))]
+            groups = group_codes[order]
+            starts = np.searchsorted(groups, groups, side="left")
+            keep[order[np.arange(len(order)) - starts < n_slots]] = True
+        rows = np.flatnonzero(keep)
+        rows = rows[np.argsort(group_codes[rows], kind="stable")]
+        counts = np.bincount(group_codes[rows], minlength=n_groups)
+        return rows, counts
+
+    def solve(self, group_codes, n_groups, formation=DEFAULT_FORMATION, metric="Overall"):
+        """
+        Best XI untuk semua grup sekaligus. Mengembalikan (players, fits)
+        berbentuk (n_groups, 11); slot tanpa pemain bernilai -1 / NaN.
+        """
+        fit = self.fit(formation, metric)
+        n_slots = fit.shape[1]
+        rows, counts = self._candidates(fit, group_codes, n_groups)
+        width = max(int(counts.max()) if len(counts) else 0, n_slots)
+        # Kolom tambahan berbiaya _UNFILLED menjamin setiap slot selalu bisa diisi
+        width += n_slots
+        offsets = np.r_[0, np.cumsum(counts)[:-1]]
+        members = np.full((n_groups, width), -1, dtype=np.int64)
+        group_of = group_codes[rows]
+        members[group_of, np.arange(len(rows)) - offsets[group_of]] = rows
+        filled = members >= 0
+        gathered = fit[np.where(filled, members, 0)]  # (grup, kandidat, slot)
+        cost = np.where(filled[:, :, None] & ~np.isnan(gathered), -gathered, _UNFILLED)
+        cost = np.ascontiguousarray(cost.transpose(0, 2, 1))
+        columns = solve_assignment(cost)
+        players = np.take_along_axis(members, columns, axis=1)
+        fits = np.take_along_axis(cost, columns[:, :, None], axis=2)[:, :, 0]
+        unfilled = (players < 0) | (fits >= _UNFILLED)
+        players = np.where(unfilled, -1, players)
+        return players, np.where(unfilled, np.nan, -fits)
+
+    def best_xi(self, formation=DEFAULT_FORMATION, rows=None, metric="Overall"):
+        """Best XI dari baris-baris tertentu (None = seluruh pemain)."""
+        group_codes = np.full(len(self.data_frame), -1, dtype=np.int64)
+        group_codes[np.arange(len(self.data_frame)) if rows is None else rows] = 0
+        players, fits = self.solve(group_codes, 1, formation, metric)
+        return players[0], fits[0]
+
+    def rank_groups(self, column="Club", formation=DEFAULT_FORMATION, metric="Overall"):
+        """(nama grup, players, fits) untuk setiap nilai kolom, misalnya semua klub."""
+        groups = self.data_frame[column]
+        if not isinstance(groups.dtype, pd.CategoricalDtype):
+            groups = groups.astype("category")
+        codes = groups.cat.codes.to_numpy().astype(np.int64)
+        players, fits = self.solve(codes, len(groups.cat.categories), formation, metric)
+        return groups.cat.categories, players, fits
+
+    def lineup(self, formation=DEFAULT_FORMATION, rows=None, metric="Overall"):
+        """DataFrame best XI: kolom Slot dan Fit di depan, lalu data pemainnya."""
+        players, fits = self.best_xi(formation, rows, metric)
+        slots = np.array(self.slots(formation), dtype=object)
+        filled = players >= 0
+        result = self.data_frame.iloc[players[filled]].copy()
+        result.insert(0, "Fit", fits[filled])
+        result.insert(0, "Slot", slots[filled])
+        return result
+
+    def top_groups(self, column="Club", top_n=10, formation=DEFAULT_FORMATION, metric="Overall"):
+        """
+        Peringkat grup berdasarkan rata-rata Fit best XI. Slot yang tidak bisa
+        diisi dihitung 0, jadi skuad yang tidak lengkap otomatis turun.
+        """
+        names, players, fits = self.rank_groups(column, formation, metric)
+        strength = np.nan_to_num(fits).sum(axis=1) / fits.shape[1]
+        filled = (players >= 0).sum(axis=1)
+        candidates = np.flatnonzero(filled > 0)
+        top = ranking.top_positions(strength, candidates, top_n)
+        return pd.DataFrame({
+            column: np.asarray(names)[top],
+            "XI Rating": strength[top],
+            "Slot Terisi": filled[top],
+        })
+
+
+def get_squad_builder(data_frame):
+    return index.get_derived(data_frame, "squad", SquadBuilder)
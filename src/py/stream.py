@@ -0,0 +1,234 @@
+import numpy as np
+import pandas as pd
+import load
+
+
+class ColumnMoments:
+    """Count/mean/M2/min/max yang bisa digabung (algoritma paralel Chan et al.)."""
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = np.nan
+        self.max = np.nan
+
+    def update(self, values):
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return
+        other = ColumnMoments()
+        other.count = len(values)
+        other.mean = float(values.mean())
+        other.m2 = float(((values - other.mean) ** 2).sum())
+        other.min = float(values.min())
+        other.max = float(values.max())
+        self.merge(other)
+
+    def merge(self, other):
+        if other.count == 0:
+            return
+        if self.count == 0:
+            self.count, self.mean, self.m2 = other.count, other.mean, other.m2
+            self.min, self.max = other.min, other.max
+            return
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta * delta * self.count * other.count / count
+        self.count = count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    @property
+    def std(self):
+        return np.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else np.nan
+
+
+class QuantileSketch:
+    """
+    Sketsa kuantil berupa pasangan (nilai, jumlah) terurut. Selama jumlah nilai
+    unik <= max_size hasilnya eksak (rating FIFA hanya 0-99); jika lebih, nilai
+    yang berdekatan digabung sehingga memori tetap terbatas.
+    """
+    def __init__(self, max_size=2048):
+        self.max_size = max_size
+        self.values = np.empty(0, dtype=np.float64)
+        self.counts = np.empty(0, dtype=np.int64)
+
+    def update(self, values):
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return
+        uniques, counts = np.unique(values, return_counts=True)
+        self._merge_arrays(uniques, counts)
+
+    def merge(self, other):
+        self._merge_arrays(other.values, other.counts)
+
+    def _merge_arrays(self, values, counts):
+        values = np.concatenate([self.values, values])
+        counts = np.concatenate([self.counts, counts])
+        uniques, inverse = np.unique(values, return_inverse=True)
+        self.values = uniques
+        self.counts = np.bincount(inverse, weights=counts, minlength=len(uniques)).astype(np.int64)
+        while len(self.values) > self.max_size:
+            self._compress()
+
+    def _compress(self):
+        # Gabungkan pasangan bertetangga menjadi rata-rata tertimbang
+        n = len(self.values) // 2 * 2
+        v, c = self.values[:n].reshape(-1, 2), self.counts[:n].reshape(-1, 2)
+        merged_counts = c.sum(axis=1)
+        merged_values = (v * c).sum(axis=1) / merged_counts
+        self.values = np.concatenate([merged_values, self.values[n:]])
+        self.counts = np.concatenate([merged_counts, self.counts[n:]])
+
+    def quantile(self, q):
+        """Kuantil dengan interpolasi linear seperti pandas.quantile."""
+        total = self.counts.sum()
+        if total == 0:
+            return np.nan
+        position = q * (total - 1)
+        cumulative = np.cumsum(self.counts)
+        lower = int(np.floor(position))
+        upper = min(lower + 1, total - 1)
+        lower_value = self.values[np.searchsorted(cumulative, lower, side="right")]
+        upper_value = self.values[np.searchsorted(cumulative, upper, side="right")]
+        return lower_value + (upper_value - lower_value) * (position - lower)
+
+
+def _top_rows(frame, metric, top_n, by=None):
+    # Urut stabil supaya saat nilai sama, baris yang lebih dulu di file menang
+    ordered = frame.sort_values(metric, ascending=False, kind="stable", na_position="last")
+    if by is None:
+        return ordered.head(top_n)
+    return ordered.groupby(by, observed=True, sort=False).head(top_n)
+
+
+class StreamingAggregator:
+    """
+    Agregat inkremental dengan memori terbatas untuk summary, top_team dan
+    top_player. Tiap chunk diproses lewat update(); dua aggregator bisa
+    digabung dengan merge() (misalnya hasil dari beberapa file).
+    """
+    PERCENTILES = (0.25, 0.5, 0.75)
+
+    def __init__(self, top_n=5, metric="Overall"):
+        self.top_n = top_n
+        self.metric = metric
+        self.rows = 0
+        self.columns = []
+        self.moments = {}
+        self.sketches = {}
+        self.club_sum = pd.Series(dtype=np.float64)
+        self.club_count = pd.Series(dtype=np.int64)
+        self.club_squad = pd.Series(dtype=np.int64)
+        self.top_overall = None
+        self.top_by_position = None
+
+    def update(self, chunk):
+        self.rows += len(chunk)
+        for col in chunk.select_dtypes(include="number").columns:
+            if col not in self.moments:
+                self.columns.append(col)
+                self.moments[col] = ColumnMoments()
+                self.sketches[col] = QuantileSketch()
+            values = chunk[col].to_numpy(dtype=np.float64, na_value=np.nan)
+            self.moments[col].update(values)
+            self.sketches[col].update(values)
+
+        if self.metric not in chunk.columns:
+            return
+        if "Club" in chunk.columns:
+            clubs = chunk["Club"].astype(object)
+            grouped = chunk[self.metric].groupby(clubs)
+            self._merge_clubs(grouped.sum(), grouped.count(), clubs.value_counts())
+        self._merge_top(_top_rows(chunk, self.metric, self.top_n),
+                        _top_rows(chunk, self.metric, self.top_n, "Position")
+                        if "Position" in chunk.columns else None)
+
+    def _merge_clubs(self, sums, counts, squads):
+        self.club_sum = self.club_sum.add(sums.astype(np.float64), fill_value=0)
+        self.club_count = self.club_count.add(counts, fill_value=0).astype(np.int64)
+        self.club_squad = self.club_squad.add(squads, fill_value=0).astype(np.int64)
+
+    def _merge_top(self, overall, by_position):
+        # Kolom kategori diubah ke object agar concat antar chunk tidak bentrok kategori
+        overall = overall.astype({c: object for c in overall.select_dtypes("category").columns})
+        frames = [f for f in (self.top_overall, overall) if f is not None]
+        self.top_overall = _top_rows(pd.concat(frames), self.metric, self.top_n)
+        if by_position is not None:
+            by_position = by_position.astype(
+                {c: object for c in by_position.select_dtypes("category").columns})
+            frames = [f for f in (self.top_by_position, by_position) if f is not None]
+            self.top_by_position = _top_rows(pd.concat(frames), self.metric, self.top_n, "Position")
+
+    def merge(self, other):
+        self.rows += other.rows
+        for col in other.columns:
+            if col not in self.moments:
+                self.columns.append(col)
+                self.moments[col] = ColumnMoments()
+                self.sketches[col] = QuantileSketch()
+            self.moments[col].merge(other.moments[col])
+            self.sketches[col].merge(other.sketches[col])
+        self._merge_clubs(other.club_sum, other.club_count, other.club_squad)
+        if other.top_overall is not None:
+            self._merge_top(other.top_overall, other.top_by_position)
+        return self
+
+    def summary(self):
+        """Setara data_frame.describe() untuk kolom numerik."""
+        stats = {}
+        for col in self.columns:
+            m, sketch = self.moments[col], self.sketches[col]
+            stats[col] = [m.count, m.mean if m.count else np.nan, m.std, m.min] + \
+                [sketch.quantile(q) for q in self.PERCENTILES] + [m.max]
+        index = ["count", "mean", "std", "min"] + \
+            [f"{q:.0%}" for q in self.PERCENTILES] + ["max"]
+        return pd.DataFrame(stats, index=index)
+
+    def top_team(self, top_n=5, min_squad=1):
+        means = (self.club_sum / self.club_count)[self.club_squad >= min_squad].dropna()
+        # Urutan nama klub dulu supaya nilai seri konsisten dengan groupby biasa
+        means = means.sort_index().sort_values(ascending=False, kind="stable")
+        return means.head(top_n).rename(self.metric).rename_axis("Club").reset_index()
+
+    def top_player(self, top_n=None, position=None):
+        top_n = self.top_n if top_n is None else min(top_n, self.top_n)
+        if position is None:
+            frame = self.top_overall
+        elif self.top_by_position is None:
+            return None
+        else:
+            frame = self.top_by_position[
+                self.top_by_position["Position"].astype(str).str.casefold() == position.casefold()]
+        if frame is None:
+            return None
+        return frame.head(top_n)
+
+
+def aggregate_csv(file_path, top_n=5, metric="Overall", chunksize=None,
+                  progress=None, cancel_event=None):
+    """Baca CSV per chunk dan kembalikan StreamingAggregator tanpa memuat seluruh file."""
+    aggregator = StreamingAggregator(top_n=top_n, metric=metric)
+    for chunk in load.iter_csv_chunks(file_path, chunksize, progress, cancel_event):
+        aggregator.update(chunk)
+    return aggregator
+
+
+def aggregate_files(sources, top_n=5, metric="Overall", chunksize=None, processes=None,
+                    progress=None, cancel_event=None):
+    """
+    Map-reduce per file: tiap file (folder, glob atau daftar path) diagregasi
+    di process pool, lalu hasilnya digabung dengan merge().
+    """
+    paths = load.expand_sources(sources)
+    parts = load.map_files(aggregate_csv, paths, (top_n, metric, chunksize), processes,
+                           progress=None if progress is None else
+                           (lambda n: progress(n / len(paths))),
+                           cancel_event=cancel_event)
+    aggregator = StreamingAggregator(top_n=top_n, metric=metric)
+    for part in parts:
+        aggregator.merge(part)
+    return aggregator
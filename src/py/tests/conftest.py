@@ -0,0 +1,25 @@
+import os
+import sys
+import pytest
+
+# Modul aplikasi diimpor langsung (import load), sama seperti saat dijalankan dari src/py
+SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SRC_DIR)
+
+DATA_FILE = os.path.join(SRC_DIR, "..", "..", "data", "male_players.csv")
+
+
+@pytest.fixture(scope="session")
+def csv_lines():
+    """Header + baris mentah data/male_players.csv."""
+    with open(DATA_FILE, encoding="utf-8") as f:
+        return f.read().splitlines()
+
+
+@pytest.fixture
+def write_csv(tmp_path):
+    def write(name, lines):
+        path = tmp_path / name
+        path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+        return str(path)
+    return write
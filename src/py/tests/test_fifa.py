@@ -0,0 +1,16 @@
+import fifa
+import load
+
+
+def test_batch_reports_bad_lines_without_exiting(csv_lines, write_csv, capsys):
+    data_frame = load.load_csv_data(write_csv("players.csv", csv_lines[:201]), use_cache=False)
+    queries = ["top-team -n 2", "top-team --bogus", "team", "nosuch x", "top-team -n abc"]
+
+    results = fifa.run_batch(data_frame, queries)
+
+    assert [r["error"] is None for r in results] == [True, False, False, False, False]
+    assert len(results[0]["frame"]) == 2
+    assert "--bogus" in results[1]["error"]
+    assert "name" in results[2]["error"]
+    captured = capsys.readouterr()
+    assert captured.err == "" and captured.out == ""
@@ -0,0 +1,83 @@
+import os
+import pandas as pd
+import load
+
+
+def test_load_many_mixes_files_with_and_without_season(csv_lines, write_csv, tmp_path):
+    header, body = csv_lines[0], csv_lines[1:]
+    write_csv("male_fc24.csv", [header] + body[:50])
+    write_csv("male_fc23.csv", [header] + body[50:80])
+    write_csv("female_players.csv", [header] + body[80:100])
+
+    data_frame = load.load_many(str(tmp_path), use_cache=False)
+
+    assert len(data_frame) == 100
+    counts = data_frame[load.SEASON_COLUMN].value_counts(dropna=False)
+    assert counts["24"] == 50
+    assert counts["23"] == 30
+    assert data_frame[load.SEASON_COLUMN].isna().sum() == 20
+    assert set(data_frame[load.SOURCE_COLUMN].cat.categories) == \
+        {"male_fc24", "male_fc23", "female_players"}
+
+
+def test_reconcile_frames_fills_missing_columns(csv_lines, write_csv):
+    header, body = csv_lines[0], csv_lines[1:]
+    full = load.load_csv_data(write_csv("a.csv", [header] + body[:10]), use_cache=False)
+    partial = full.drop(columns=["Pace", "Club"])
+
+    merged = load.reconcile_frames([partial, full], seasons=[None, "24"])
+
+    assert list(merged.columns[:len(full.columns)]) == list(full.columns)
+    assert merged["Pace"].iloc[:10].isna().all()
+    assert merged["Club"].iloc[:10].isna().all()
+    assert merged["Pace"].iloc[10:].tolist() == full["Pace"].tolist()
+
+
+def _count_parses(monkeypatch):
+    calls = []
+    original = load.read_csv_fifa
+
+    def counting(*args, **kwargs):
+        calls.append(args[0])
+        return original(*args, **kwargs)
+    monkeypatch.setattr(load, "read_csv_fifa", counting)
+    return calls
+
+
+def test_binary_cache_warm_load_equals_cold(csv_lines, write_csv, tmp_path, monkeypatch):
+    path = write_csv("players.csv", csv_lines[:301])
+    cache_root = str(tmp_path / "cache")
+    parses = _count_parses(monkeypatch)
+
+    cold = load.load_csv_data(path, cache_root=cache_root)
+    warm = load.load_csv_data(path, cache_root=cache_root)
+
+    assert len(parses) == 1
+    assert os.path.exists(os.path.join(load._cache_dir(path, cache_root), "manifest.json"))
+    pd.testing.assert_frame_equal(warm, cold)
+    pd.testing.assert_frame_equal(warm, load.load_csv_data(path, use_cache=False))
+
+
+def test_binary_cache_invalidated_by_mtime_or_size(csv_lines, write_csv, tmp_path, monkeypatch):
+    lines = csv_lines[:301]
+    path = write_csv("players.csv", lines)
+    cache_root = str(tmp_path / "cache")
+    parses = _count_parses(monkeypatch)
+    load.load_csv_data(path, cache_root=cache_root)
+
+    # Isi sama, mtime berubah
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    load.load_csv_data(path, cache_root=cache_root)
+    assert len(parses) == 2
+
+    # Ukuran berubah, mtime dikembalikan ke nilai yang sudah tercatat di cache
+    stat = os.stat(path)
+    write_csv("players.csv", lines[:-1])
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    data_frame = load.load_csv_data(path, cache_root=cache_root)
+    assert len(parses) == 3
+    assert len(data_frame) == len(lines) - 2
+
+    load.load_csv_data(path, cache_root=cache_root)
+    assert len(parses) == 3
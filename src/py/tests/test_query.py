@@ -0,0 +1,74 @@
+import numpy as np
+import pytest
+import features
+import load
+import query
+
+QUERIES = [
+    "Nation = Brazil AND Position IN {ST, CF} AND Age < 23 AND Pace >= 85 ORDER BY Overall DESC LIMIT 50",
+    "Club = \"Paris SG\" ORDER BY Overall DESC, Name ASC",
+    "Overall BETWEEN 80 AND 85 AND Position NOT IN {GK}",
+    "Preferred foot != Right AND Weak foot >= 4 LIMIT 10",
+    "ORDER BY Age ASC LIMIT 5",
+]
+
+
+@pytest.fixture(scope="module")
+def data_frame(csv_lines, tmp_path_factory):
+    path = tmp_path_factory.mktemp("query") / "players.csv"
+    path.write_text("\n".join(csv_lines[:3001]) + "\n", encoding="utf-8")
+    return load.load_csv_data(str(path), use_cache=False)
+
+
+@pytest.mark.parametrize("text", QUERIES)
+def test_to_text_round_trips(text):
+    parsed = query.parse(text)
+    assert query.parse(query.to_text(parsed)) == parsed
+
+
+def test_parse_structure():
+    parsed = query.parse(QUERIES[0])
+    assert parsed.conditions == (
+        query.Condition("Nation", "=", "Brazil"),
+        query.Condition("Position", "in", ("ST", "CF")),
+        query.Condition("Age", "<", "23"),
+        query.Condition("Pace", ">=", "85"),
+    )
+    assert parsed.order_by == (("Overall", True),)
+    assert parsed.limit == 50
+
+
+@pytest.mark.parametrize("text", [
+    "Overall >=", "Overall ~ 5", "Position IN ST", "ORDER Overall", "LIMIT x", "Overall > 5 extra)",
+])
+def test_invalid_queries_raise(text):
+    with pytest.raises(query.FilterError):
+        query.parse(text)
+
+
+def test_engine_matches_pandas(data_frame):
+    rows = query.QueryEngine(data_frame).run(query.parse(
+        "Position IN {ST, CF} AND Age < 25 AND Pace >= 80 ORDER BY Overall DESC"))
+    expected = data_frame[
+        data_frame["Position"].isin(["ST", "CF"]) & (data_frame["Age"] < 25) & (data_frame["Pace"] >= 80)
+    ]
+    assert sorted(rows.tolist()) == sorted(expected.index.tolist())
+    overall = data_frame["Overall"].to_numpy()[rows]
+    assert (np.diff(overall) <= 0).all()
+
+
+def test_engine_is_case_insensitive_and_checks_types(data_frame):
+    engine = query.QueryEngine(data_frame)
+    club = str(data_frame["Club"].iloc[0])
+    rows = engine.run(query.parse(f'club = "{club.upper()}"'))
+    assert set(rows.tolist()) == set(np.flatnonzero((data_frame["Club"] == club).to_numpy()))
+    with pytest.raises(query.FilterError):
+        engine.run(query.parse("Name > 5"))
+    with pytest.raises(query.FilterError):
+        engine.run(query.parse("Unknown = 1"))
+
+
+def test_features_query_returns_frame(data_frame):
+    result = features.query(data_frame, "Overall >= 85 ORDER BY Overall DESC LIMIT 3")
+    assert len(result) <= 3
+    assert (result["Overall"] >= 85).all()
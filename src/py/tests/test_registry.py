@@ -0,0 +1,26 @@
+import load
+import registry
+
+
+def test_metadata_for_reads_season_and_gender_from_file_name():
+    assert registry.DatasetRegistry.metadata_for("data/male_players_fc24.csv") == ("24", "M")
+    assert registry.DatasetRegistry.metadata_for("data/female_players.csv") == (None, "F")
+    assert registry.DatasetRegistry.metadata_for("data/players_2023.csv") == ("2023", None)
+
+
+def test_add_file_records_metadata_and_keys_for_filters(csv_lines, write_csv):
+    header, body = csv_lines[0], csv_lines[1:]
+    reg = registry.DatasetRegistry()
+    keys = {}
+    for name, rows in (("male_fc24.csv", body[:20]), ("male_fc23.csv", body[20:40]),
+                       ("female_fc24.csv", body[40:60])):
+        path = write_csv(name, [header] + rows)
+        # Tanpa kolom Gender, gender diambil dari nama file
+        frame = load.load_csv_data(path, use_cache=False).drop(columns=["Gender"])
+        keys[name] = reg.add_file(frame, path)
+
+    assert reg.info(keys["male_fc23.csv"]) == {"season": "23", "gender": "M"}
+    assert reg.keys_for(season="24") == [keys["male_fc24.csv"], keys["female_fc24.csv"]]
+    assert reg.keys_for(gender="F") == [keys["female_fc24.csv"]]
+    view = reg.union(tuple(reg.keys_for(season="24")))
+    assert len(view) == 40
@@ -0,0 +1,156 @@
+import os
+import pytest
+import cache
+import features
+import index
+import load
+import reload
+
+URL_FIELD = 44
+OVERALL_FIELD = 6
+PACE_FIELD = 7
+
+
+def _set_field(line, field, value):
+    parts = line.split(",")
+    parts[field] = value
+    return ",".join(parts)
+
+
+def _rewrite(path, lines):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+    # Pastikan stempel berubah walaupun ukuran file sama
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+
+def _assert_same_rows(actual, expected):
+    actual = actual.reset_index(drop=True)
+    expected = expected.reset_index(drop=True)
+    assert list(actual.columns) == list(expected.columns)
+    for col in expected.columns:
+        left, right = actual[col].astype(object), expected[col].astype(object)
+        same = (left == right) | (left.isna() & right.isna())
+        assert same.all(), col
+
+
+@pytest.fixture
+def source(csv_lines, write_csv):
+    lines = csv_lines[:301]
+    path = write_csv("players.csv", lines)
+    data_frame = load.load_csv_data(path, use_cache=False)
+    features.prepare(data_frame)
+    watcher = reload.SourceWatcher(path, data_frame)
+    assert watcher.snapshot is None
+    assert watcher.prepare()
+    return path, list(lines), data_frame, watcher
+
+
+def test_unchanged_file_gives_empty_delta(source):
+    path, lines, data_frame, watcher = source
+    assert watcher.supported
+    _rewrite(path, lines)
+    assert watcher.changed()
+    delta = watcher.poll()
+    assert delta.empty
+    assert watcher.apply(delta) is data_frame
+    assert not watcher.changed()
+
+
+def test_value_update_is_applied_in_place(source):
+    path, lines, data_frame, watcher = source
+    name = data_frame["Name"].iloc[4]
+    before = features.top_player(data_frame, 1)
+    lines[5] = _set_field(lines[5], OVERALL_FIELD, "99")
+    _rewrite(path, lines)
+
+    delta = watcher.poll()
+    assert (len(delta.inserted), len(delta.updated), len(delta.deleted)) == (0, 1, 0)
+    assert delta.columns == ["Overall"]
+    assert delta.in_place
+    token = cache.version(data_frame)
+    assert watcher.apply(delta) is data_frame
+
+    _assert_same_rows(data_frame, load.load_csv_data(path, use_cache=False))
+    # Versi baru dipakai (hasil cache lama tidak terbaca) dan tetap tersimpan
+    assert cache.version(data_frame) != token
+    assert cache.version(data_frame) == cache.version(data_frame)
+    assert features.top_player(data_frame, 1)["Name"].iloc[0] == name
+    assert before["Name"].iloc[0] != name
+
+
+def test_insert_and_delete_rebuild_frame(source):
+    path, lines, data_frame, watcher = source
+    new_row = _set_field(_set_field(lines[10], 1, "Pemain Baru"), URL_FIELD, "https://example.com/baru")
+    lines = lines[:3] + [new_row] + lines[4:]
+    lines[20], lines[21] = lines[21], lines[20]
+    _rewrite(path, lines)
+
+    delta = watcher.poll()
+    assert (len(delta.inserted), len(delta.updated), len(delta.deleted)) == (1, 0, 1)
+    assert not delta.in_place
+    result = watcher.apply(delta)
+    assert result is not data_frame
+    _assert_same_rows(result, load.load_csv_data(path, use_cache=False))
+
+
+def test_reordered_update_keeps_snapshot_aligned(source):
+    path, lines, data_frame, watcher = source
+    lines[30], lines[31] = lines[31], lines[30]
+    lines[40] = _set_field(lines[40], PACE_FIELD, "12")
+    _rewrite(path, lines)
+    delta = watcher.poll()
+    assert delta.in_place and delta.columns == ["Pace"]
+    watcher.apply(delta)
+
+    # Perubahan berikutnya harus tetap dicocokkan ke baris yang benar
+    lines[31] = _set_field(lines[31], PACE_FIELD, "13")
+    _rewrite(path, lines)
+    watcher.apply(watcher.poll())
+    expected = load.load_csv_data(path, use_cache=False).set_index(reload.KEY_COLUMN)
+    actual = data_frame.set_index(reload.KEY_COLUMN).loc[expected.index]
+    assert actual["Pace"].tolist() == expected["Pace"].tolist()
+
+
+def test_changed_header_needs_full_reload(source):
+    path, lines, data_frame, watcher = source
+    lines[0] = lines[0].replace("Overall", "OVR")
+    _rewrite(path, lines)
+    with pytest.raises(reload.ReloadError):
+        watcher.poll()
+
+
+def test_invalidate_columns_keeps_unrelated_structures(source):
+    path, lines, data_frame, watcher = source
+    lookup = index.get_lookup_index(data_frame)
+    token = cache.version(data_frame)
+    index.invalidate_columns(data_frame, ["Pace"])
+    assert index.get_lookup_index(data_frame) is lookup
+    assert cache.version(data_frame) == token
+    index.invalidate_columns(data_frame, ["Club"])
+    assert index.get_lookup_index(data_frame) is not lookup
+
+
+def test_change_before_prepare_needs_full_reload(csv_lines, write_csv):
+    lines = csv_lines[:51]
+    path = write_csv("players.csv", lines)
+    data_frame = load.load_csv_data(path, use_cache=False)
+    watcher = reload.SourceWatcher(path, data_frame)
+    _rewrite(path, lines[:-1])
+    assert not watcher.prepare()
+    with pytest.raises(reload.ReloadError):
+        watcher.poll()
+
+
+def test_duplicate_or_missing_keys_are_not_supported(csv_lines, write_csv):
+    lines = csv_lines[:51]
+    path = write_csv("players.csv", lines + [lines[1]])
+    watcher = reload.SourceWatcher(path, load.load_csv_data(path, use_cache=False))
+    assert not watcher.supported
+    assert not watcher.prepare()
+
+    other = write_csv("other.csv", lines)
+    data_frame = load.load_csv_data(other, use_cache=False)
+    data_frame.loc[3, reload.KEY_COLUMN] = None
+    assert not reload.SourceWatcher(other, data_frame).supported
@@ -0,0 +1,46 @@
+import itertools
+import numpy as np
+import pytest
+import features
+import load
+import squad
+
+
+def _brute_force(cost):
+    n, m = cost.shape
+    return min(sum(cost[i, cols[i]] for i in range(n))
+               for cols in itertools.permutations(range(m), n))
+
+
+def test_solve_assignment_matches_brute_force():
+    rng = np.random.default_rng(0)
+    for _ in range(300):
+        n = int(rng.integers(1, 5))
+        m = int(rng.integers(n, 7))
+        cost = rng.integers(0, 20, size=(n, m)).astype(np.float64)
+        columns = squad.solve_assignment(cost)
+        assert len(set(columns.tolist())) == n
+        assert cost[np.arange(n), columns].sum() == _brute_force(cost)
+
+
+def test_solve_assignment_batched_equals_single():
+    rng = np.random.default_rng(1)
+    cost = rng.random((25, 4, 6))
+    batched = squad.solve_assignment(cost)
+    for group in range(len(cost)):
+        single = squad.solve_assignment(cost[group])
+        assert cost[group][np.arange(4), batched[group]].sum() == \
+            pytest.approx(cost[group][np.arange(4), single].sum())
+
+
+def test_solve_assignment_rejects_more_rows_than_columns():
+    with pytest.raises(ValueError):
+        squad.solve_assignment(np.zeros((3, 2)))
+
+
+def test_best_xi_fills_every_slot_once(csv_lines, write_csv):
+    data_frame = load.load_csv_data(write_csv("players.csv", csv_lines[:2001]), use_cache=False)
+    result = features.best_xi(data_frame, "4-3-3")
+    assert len(result) == 11
+    assert result.index.is_unique
+    assert sorted(result["Slot"]) == sorted(squad.FORMATIONS["4-3-3"])
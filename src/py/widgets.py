@@ -0,0 +1,78 @@
+import tkinter as tk
+from tkinter import ttk
+import numpy as np
+
+
+class VirtualTable(ttk.Frame):
+    """
+    Treeview untuk tabel besar. Baris dimasukkan per halaman (page_size) dan
+    halaman berikutnya diambil saat scroll mendekati bawah, langsung dari array
+    NumPy per kolom tanpa iterrows. Klik header untuk mengurutkan kolom; urutan
+    tiap kolom dihitung sekali lalu disimpan.
+    """
+    def __init__(self, master, data_frame, column_width=100, page_size=200, **kwargs):
+        super().__init__(master, **kwargs)
+        self.page_size = page_size
+        self.columns = list(data_frame.columns)
+        self._data = data_frame.reset_index(drop=True)
+        self._arrays = [self._data[col].to_numpy() for col in self.columns]
+        self._orders = {}
+        self._order = np.arange(len(self._data))
+        self._loaded = 0
+        self._sort_state = None
+
+        self.scroll_y = ttk.Scrollbar(self, orient="vertical")
+        self.scroll_x = ttk.Scrollbar(self, orient="horizontal")
+        self.tree = ttk.Treeview(self, columns=self.columns, show="headings",
+                                 yscrollcommand=self._on_yscroll,
+                                 xscrollcommand=self.scroll_x.set)
+        self.scroll_y.config(command=self.tree.yview)
+        self.scroll_x.config(command=self.tree.xview)
+
+        self.tree.grid(row=0, column=0, sticky="nsew")
+        self.scroll_y.grid(row=0, column=1, sticky="ns")
+        self.scroll_x.grid(row=1, column=0, sticky="ew")
+        self.rowconfigure(0, weight=1)
+        self.columnconfigure(0, weight=1)
+
+        for col in self.columns:
+            self.tree.heading(col, text=col, command=lambda c=col: self.sort_by(c))
+            self.tree.column(col, width=column_width, anchor="center")
+        self._load_more()
+
+    def __len__(self):
+        return len(self._order)
+
+    def _on_yscroll(self, first, last):
+        self.scroll_y.set(first, last)
+        if float(last) > 0.9 and self._loaded < len(self._order):
+            # Tunda ke idle agar tidak memasukkan baris di tengah callback scroll
+            self.after_idle(self._load_more)
+
+    def _load_more(self):
+        start = self._loaded
+        stop = min(start + self.page_size, len(self._order))
+        if start >= stop:
+            return
+        rows = self._order[start:stop]
+        page = zip(*(array[rows].tolist() for array in self._arrays))
+        for values in page:
+            self.tree.insert("", tk.END, values=values)
+        self._loaded = stop
+
+    def _column_order(self, col, descending):
+        key = (col, descending)
+        if key not in self._orders:
+            self._orders[key] = self._data[col].sort_values(
+                ascending=not descending, kind="stable", na_position="last"
+            ).index.to_numpy()
+        return self._orders[key]
+
+    def sort_by(self, col):
+        descending = self._sort_state == (col, False)
+        self._sort_state = (col, descending)
+        self._order = self._column_order(col, descending)
+        self.tree.delete(*self.tree.get_children())
+        self._loaded = 0
+        self._load_more()
+        self.tree.yview_moveto(0)